@@ -0,0 +1,123 @@
+"""Compares the per-building economy update with the vectorized Economy tick.
+
+Run from the repository root: python benchmarks/economy_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game.economy import Economy
+from game.buildings import Buildings
+from game.resource_manager import ResourceManager
+from game.clock import SimClock
+from game.settings import ECONOMY_TICK
+
+BUILDING_COUNTS = [100, 1000, 10000, 100000]
+LEGACY_MAX = 10000
+TICKS = 20
+# one solar panel and one water treatment plant for every 4 factories and 4 residential buildings
+MIX = ["factory"] * 4 + ["residential_building"] * 4 + ["solar_panels", "water_treatment_plant"]
+# a utility for every residential building and no factories, the upkeep soon costs more than the city earns
+UTILITY_MIX = ["residential_building", "solar_panels", "water_treatment_plant"]
+# (name, building mix, thugoleons per building at the start)
+CITIES = [("funded", MIX, 10 ** 8), ("broke", UTILITY_MIX, 200)]
+
+class LegacyBuilding:
+    def __init__(self, name, resource_manager):
+        """The attributes and update the buildings used before the economy tick"""
+        attributes = Buildings()
+        self.name = name
+        self.resource_manager = resource_manager
+        self.electricity = 50 if name != "solar_panels" else 0
+        self.water = 50 if name != "water_treatment_plant" else 0
+        consumption = attributes.consumption[name]
+        self.electricity_consumption = consumption.get("electricity", 0)
+        self.water_consumption = consumption.get("water", 0)
+        self.thugoleon_consumption = consumption.get("thugoleons", 0)
+        production = attributes.production[name]
+        self.electricity_production_rate = production.get("electricity", 0)
+        self.water_production_rate = production.get("water", 0)
+        self.thugoleon_production_rate = production.get("thugoleons", 0)
+        self.worker_count_current = 3 if name == "factory" else 0
+        if name == "factory":
+            self.thugoleon_production_rate = production["thugoleons"] // 5 * self.worker_count_current
+
+    def check_has_resources(self):
+        resources = self.resource_manager.resources
+        return (self.electricity >= self.electricity_consumption and
+                self.water >= self.water_consumption and
+                resources["thugoleons"] >= self.thugoleon_consumption)
+
+    def update(self):
+        if self.check_has_resources():
+            resources = self.resource_manager.resources
+            self.electricity += self.electricity_production_rate - self.electricity_consumption
+            self.water += self.water_production_rate - self.water_consumption
+            resources["electricity"] += self.electricity_production_rate - self.electricity_consumption
+            resources["water"] += self.water_production_rate - self.water_consumption
+            resources["thugoleons"] += self.thugoleon_production_rate - self.thugoleon_consumption
+
+class Row:
+    def __init__(self, name):
+        """Stand-in for a building, the economy only needs its name"""
+        self.name = name
+
+def legacy_city(count, mix, thugoleons):
+    resource_manager = ResourceManager()
+    resource_manager.resources["thugoleons"] = thugoleons * count
+    buildings = [LegacyBuilding(mix[i % len(mix)], resource_manager) for i in range(count)]
+    # the economy pays table by table, the per-building update runs in the same order to spend the thugoleons alike
+    tables = list(Economy(ResourceManager(), SimClock()).tables)
+    buildings.sort(key=lambda building: tables.index(building.name))
+    return resource_manager, buildings
+
+def economy_city(count, mix, thugoleons):
+    resource_manager = ResourceManager()
+    resource_manager.resources["thugoleons"] = thugoleons * count
+    clock = SimClock()
+    economy = Economy(resource_manager, clock)
+    # copy the starting state of the legacy buildings into the arrays
+    for building in legacy_city(count, mix, thugoleons)[1]:
+        row = Row(building.name)
+        economy.add(row)
+        table = economy.tables[row.name]
+        for field, values in table.data.items():
+            if field == "thugoleon_production_per_worker":
+                values[row.economy_index] = 1000 if row.name == "factory" else 0
+            else:
+                values[row.economy_index] = getattr(building, field)
+    return resource_manager, economy
+
+def run_legacy(buildings):
+    for _ in range(TICKS):
+        for building in buildings:
+            building.update()
+
+def run_economy(economy):
+    for _ in range(TICKS):
+        economy.tick()
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def main():
+    print(f"{TICKS} ticks of {ECONOMY_TICK} ms")
+    print(f"{'city':>7} {'buildings':>10} {'legacy (ms/tick)':>17} {'vectorized (ms/tick)':>21} {'speedup':>9} {'resources match':>16}")
+    for name, mix, thugoleons in CITIES:
+        for count in BUILDING_COUNTS:
+            economy_resources, economy = economy_city(count, mix, thugoleons)
+            economy_time = timed(run_economy, economy) / TICKS * 1000
+
+            if count > LEGACY_MAX:
+                print(f"{name:>7} {count:>10} {'-':>17} {economy_time:>21.3f} {'-':>9} {'-':>16}")
+                continue
+            legacy_resources, buildings = legacy_city(count, mix, thugoleons)
+            legacy_time = timed(run_legacy, buildings) / TICKS * 1000
+            matches = legacy_resources.resources == economy_resources.resources
+            print(f"{name:>7} {count:>10} {legacy_time:>17.3f} {economy_time:>21.3f} {legacy_time / economy_time:>8.1f}x {str(matches):>16}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compares the pathfinding library's A* with the flat-array A* the road network searches with.
+
+Run from the repository root: python benchmarks/pathfinding_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+from game.astar import FlatAStar
+
+SIZES = [30, 100, 256]
+SEARCHES = 50
+SEED = 1
+
+def typical(x, y, rng):
+    """Streets every 5 tiles with a few missing pieces, like a grown city"""
+    return (x % 5 == 0 or y % 5 == 0) and rng.random() < 0.95
+
+def dense(x, y, rng):
+    """Every other row and column is a street, many equally short paths"""
+    return x % 2 == 0 or y % 2 == 0
+
+def serpentine(x, y, rng):
+    """One road snaking over the whole map, every path is as long as it gets"""
+    size = serpentine.size
+    return y % 2 == 0 or (x == size - 1 and y % 4 == 1) or (x == 0 and y % 4 == 3)
+
+LAYOUTS = [("typical", typical), ("dense", dense), ("serpentine", serpentine)]
+
+def road_matrix(layout, size):
+    rng = random.Random(SEED)
+    serpentine.size = size
+    return [[1 if layout(x, y, rng) else 0 for x in range(size)] for y in range(size)]
+
+def connected_pairs(matrix, count):
+    """Random road tile pairs on the same part of the network"""
+    size = len(matrix)
+    roads = [(x, y) for y in range(size) for x in range(size) if matrix[y][x]]
+    # label the parts with one search each
+    part = {}
+    for tile in roads:
+        if tile in part:
+            continue
+        part[tile] = tile
+        frontier = [tile]
+        while frontier:
+            x, y = frontier.pop()
+            for neighbor in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= neighbor[0] < size and 0 <= neighbor[1] < size and matrix[neighbor[1]][neighbor[0]] and neighbor not in part:
+                    part[neighbor] = tile
+                    frontier.append(neighbor)
+    rng = random.Random(SEED)
+    pairs = []
+    while len(pairs) < count:
+        start, end = rng.choice(roads), rng.choice(roads)
+        if part[start] == part[end]:
+            pairs.append((start, end))
+    return pairs
+
+def library_search(matrix, start, end):
+    """What each path request did before: copy the matrix, build a Grid and run the library's A*"""
+    grid = Grid(matrix=[row[:] for row in matrix])
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.never)
+    path, runs = finder.find_path(grid.node(*start), grid.node(*end), grid)
+    return path
+
+def timed(function, pairs):
+    start = time.perf_counter()
+    paths = [function(*pair) for pair in pairs]
+    return (time.perf_counter() - start) / len(pairs) * 1000, paths
+
+def main():
+    print(f"{SEARCHES} searches between random connected road tiles")
+    print(f"{'layout':>10} {'size':>5} {'library (ms)':>13} {'flat (ms)':>10} {'speedup':>9} {'same lengths':>13}")
+    for name, layout in LAYOUTS:
+        for size in SIZES:
+            matrix = road_matrix(layout, size)
+            pairs = connected_pairs(matrix, SEARCHES)
+            astar = FlatAStar(size, size)
+            for y in range(size):
+                for x in range(size):
+                    astar.set_road((x, y), matrix[y][x])
+
+            library_time, library_paths = timed(lambda start, end: library_search(matrix, start, end), pairs)
+            flat_time, flat_paths = timed(astar.find_path, pairs)
+            same = all(len(a) == len(b) for a, b in zip(library_paths, flat_paths))
+            print(f"{name:>10} {size:>5} {library_time:>13.3f} {flat_time:>10.3f} {library_time / flat_time:>8.1f}x {str(same):>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compares the per-tile Perlin terrain generation with the batched numpy TerrainGenerator.
+
+Run from the repository root: python benchmarks/terrain_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+import perlin_noise as noise
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from game.terrain import TerrainGenerator
+
+LEGACY_SIZES = [30, 64, 128]
+BATCHED_SIZES = [30, 64, 128, 256, 512, 1024]
+SEEDS = [1, 4242, 987654]
+
+def legacy_tile(seed, perlin_scale, grid_x, grid_y):
+    """The per-tile generator World.grid_to_world used before the batched terrain engine"""
+    base_x = grid_x + seed * 0.1
+    base_y = grid_y + seed * 0.1
+
+    elevation_noise = noise.PerlinNoise(octaves=1, seed=int(seed))
+    moisture_noise = noise.PerlinNoise(octaves=2, seed=int(seed + 1))
+
+    elevation = 0
+    amplitude = 1.1
+    frequency = 1.0
+    for i in range(2):
+        elevation += amplitude * elevation_noise([base_x / perlin_scale * frequency, base_y / perlin_scale * frequency])
+        amplitude *= 0.5
+        frequency *= 2
+    moisture = moisture_noise([base_x / perlin_scale * 2, base_y / perlin_scale * 2])
+
+    elevation = (elevation + 1) / 2
+    moisture = (moisture + 1) / 2
+    random_variation = random.random()
+
+    if elevation <= 0.35:
+        tile = "water"
+    elif elevation <= 0.41:
+        tile = "mud"
+    elif elevation > 0.8:
+        tile = "rock"
+    elif moisture > 0.6 and elevation < 0.7:
+        tile = "trees"
+    elif random_variation < 0.04:
+        if moisture > 0.4:
+            tile = "trees"
+        elif elevation > 0.58:
+            tile = "rock"
+        else:
+            tile = ""
+    else:
+        tile = ""
+    return elevation, moisture, tile
+
+def legacy_world(seed, size):
+    random.seed(seed)
+    return [[legacy_tile(seed, size/2, x, y) for y in range(size)] for x in range(size)]
+
+def batched_world(seed, size):
+    random.seed(seed)
+    return TerrainGenerator(seed, size, size).generate()
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    print(f"{'size':>6} {'legacy (s)':>12} {'batched (s)':>12} {'speedup':>9} {'biomes match':>13}")
+    for size in BATCHED_SIZES:
+        legacy_time = None
+        matches = True
+        batched_time = 0
+        for seed in SEEDS:
+            terrain, elapsed = timed(batched_world, seed, size)
+            batched_time += elapsed / len(SEEDS)
+            if size in LEGACY_SIZES:
+                legacy, elapsed = timed(legacy_world, seed, size)
+                legacy_time = (legacy_time or 0) + elapsed / len(SEEDS)
+                tiles = terrain["tile"].tolist()
+                matches = matches and all(legacy[x][y][2] == tiles[x][y] for x in range(size) for y in range(size))
+
+        if legacy_time is None:
+            print(f"{size:>6} {'-':>12} {batched_time:>12.4f} {'-':>9} {'-':>13}")
+        else:
+            print(f"{size:>6} {legacy_time:>12.4f} {batched_time:>12.4f} {legacy_time / batched_time:>8.0f}x {str(matches):>13}")
+
+if __name__ == "__main__":
+    main()
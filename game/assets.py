@@ -0,0 +1,73 @@
+import pygame as pg
+
+class Assets:
+    def __init__(self):
+        """Process-wide registry of textures, every image is loaded, converted and scaled once"""
+        self.surfaces = {}
+        self.loads = 0
+        self.hits = 0
+
+    def image(self, path, scale=1):
+        """Returns the shared surface of an image, loading it on first use"""
+        key = (path, scale)
+        if key in self.surfaces:
+            self.hits += 1
+            return self.surfaces[key]
+
+        if scale == 1:
+            image = pg.image.load(path).convert_alpha()
+            self.loads += 1
+        else:
+            image = self.image(path)
+            image = pg.transform.scale(image, (image.get_width()*scale, image.get_height()*scale))
+        self.surfaces[key] = image
+        return image
+
+    def sprite(self, path, scale=1):
+        """Returns the shared run-length encoded copy of an image for sprites blitted straight onto the screen"""
+        key = ("sprite", path, scale)
+        if key in self.surfaces:
+            self.hits += 1
+            return self.surfaces[key]
+
+        # encoding skips the transparent areas quickly, but blends slightly differently onto surfaces with alpha,
+        # so terrain baked into chunks keeps using the plain images
+        image = self.image(path, scale).copy()
+        image.set_alpha(255, pg.RLEACCEL)
+        self.surfaces[key] = image
+        return image
+
+    def surface(self, name, create):
+        """Returns a shared generated surface, creating it on first use"""
+        if name in self.surfaces:
+            self.hits += 1
+            return self.surfaces[name]
+        self.surfaces[name] = create()
+        return self.surfaces[name]
+
+    def preload(self):
+        """Loads every texture up front so no disk access happens while playing"""
+        for name in ["block", "rock", "trees", "water", "mud", "residential_building", "factory", "solar_panels", "water_treatment_plant"]:
+            self.image(f"assets/graphics/{name}.png")
+        for i in range(4):
+            self.image(f"assets/graphics/water_animation/water_{i}.png")
+        for name in ["residential_building", "factory", "solar_panels", "water_treatment_plant"]:
+            self.sprite(f"assets/graphics/{name}.png")
+        for i in range(1, 16):
+            self.sprite(f"assets/graphics/road_tiles/road_{i}.png")
+        for i in range(1, 6):
+            self.sprite(f"assets/graphics/citizen{i}.png", 2)
+        for resource_type in ["electricity", "water"]:
+            self.sprite(f"assets/graphics/agent_{resource_type}.png", 2)
+
+    def memory_usage(self):
+        """Returns the number of bytes used by the pixels of every cached surface"""
+        return sum(surface.get_bytesize() * surface.get_width() * surface.get_height() for surface in self.surfaces.values())
+
+    def report(self):
+        """Summary of the cache for performance tracking"""
+        return (f"Assets: {len(self.surfaces)} surfaces, {self.loads} loads from disk, "
+                f"{self.hits} cache hits, {self.memory_usage() / 1024 / 1024:.1f} MB")
+
+# shared by every entity of the game
+assets = Assets()
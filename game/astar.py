@@ -0,0 +1,76 @@
+import heapq
+from array import array
+from collections import namedtuple
+
+Tile = namedtuple("Tile", ["x", "y"])  # a step of a path, read as node.x and node.y like the pathfinding library's nodes
+
+class TilePath:
+    def __init__(self, indices, width):
+        """A path stored as flat tile indices (y * width + x), steps are made into Tiles when they are read"""
+        self.indices = indices
+        self.width = width
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        y, x = divmod(self.indices[index], self.width)
+        return Tile(x, y)
+
+class FlatAStar:
+    def __init__(self, width, height):
+        """4-neighbor A* over a flat road mask, its buffers are allocated once and reused by every search"""
+        self.width = width
+        self.height = height
+        size = width * height
+        self.mask = bytearray(size)  # 1 on road tiles
+        self.cost = array("i", bytes(4 * size))  # steps from the start of the current search
+        self.parent = array("i", bytes(4 * size))
+        self.seen = array("I", bytes(4 * size))  # search number a tile was last reached in, nothing needs clearing
+        self.closed = array("I", bytes(4 * size))
+        self.searches = 0
+
+    def set_road(self, grid_pos, road):
+        self.mask[grid_pos[1] * self.width + grid_pos[0]] = 1 if road else 0
+
+    def find_path(self, start, end):
+        """Tiles from start to end as a TilePath, or an empty list, start may be off the roads"""
+        width, size = self.width, self.width * self.height
+        mask, cost, parent, seen, closed = self.mask, self.cost, self.parent, self.seen, self.closed
+        self.searches += 1
+        search = self.searches
+        start_index = start[1] * width + start[0]
+        end_index = end[1] * width + end[0]
+        end_x, end_y = end
+
+        # heap entries are single ints, estimate * size + tile, ties go to the lower tile index
+        cost[start_index] = 0
+        seen[start_index] = search
+        queue = [(abs(start[0] - end_x) + abs(start[1] - end_y)) * size + start_index]
+        while queue:
+            index = heapq.heappop(queue) % size
+            if closed[index] == search:
+                continue
+            closed[index] = search
+            if index == end_index:
+                break
+            y, x = divmod(index, width)
+            step_cost = cost[index] + 1
+            for neighbor, inside in ((index - 1, x > 0), (index + 1, x < width - 1),
+                                     (index - width, y > 0), (index + width, index + width < size)):
+                if not inside or not mask[neighbor] or closed[neighbor] == search:
+                    continue
+                if seen[neighbor] != search or step_cost < cost[neighbor]:
+                    seen[neighbor] = search
+                    cost[neighbor] = step_cost
+                    parent[neighbor] = index
+                    neighbor_y, neighbor_x = divmod(neighbor, width)
+                    heapq.heappush(queue, (step_cost + abs(neighbor_x - end_x) + abs(neighbor_y - end_y)) * size + neighbor)
+        if closed[end_index] != search:
+            return []
+
+        indices = array("i", [end_index])
+        while indices[-1] != start_index:
+            indices.append(parent[indices[-1]])
+        indices.reverse()
+        return TilePath(indices, width)
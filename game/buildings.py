@@ -1,4 +1,5 @@
-import pygame as pg
+from .assets import assets
+from .economy import EconomyField
 
 class Buildings:
     def __init__(self):
@@ -12,7 +13,7 @@ class Buildings:
 
         # For exclamation mark warning
         from .warning import create_warning_image
-        self.warning_image = create_warning_image()
+        self.warning_image = assets.surface("warning", create_warning_image)
 
         self.consumption = {
             "factory": {
@@ -67,13 +68,25 @@ class Buildings:
                     return
 
     def check_has_resources(self):
-        """Check if the building has enough resources to function"""
-        # Default implementation for base class - derived classes will override
-        return False  # Default to showing warning until actual resources are checked
+        """Check if the building had enough resources to function at the last economy tick"""
+        return bool(self.economy.tables[self.name].has_resources[self.economy_index])
+
+    def update(self):
+        # production and consumption run for all buildings at once in the economy
+        pass
 
 class Factory(Buildings):
+    # stored in the economy arrays
+    electricity = EconomyField("electricity")
+    water = EconomyField("water")
+    electricity_consumption = EconomyField("electricity_consumption")
+    water_consumption = EconomyField("water_consumption")
+    thugoleon_production_rate = EconomyField("thugoleon_production_rate")
+    thugoleon_production_per_worker = EconomyField("thugoleon_production_per_worker")
+    worker_count_current = EconomyField("worker_count_current")
+
     def __init__(self, pos, resource_manager, world=None, grid_pos=None):
-        image = pg.image.load("assets/graphics/factory.png")
+        image = assets.sprite("assets/graphics/factory.png")
         self.resources = Buildings()
         self.image = image
         self.name = "factory"
@@ -83,7 +96,8 @@ class Factory(Buildings):
         # Get warning image from instance of building class
         self.warning_image = self.resources.warning_image
 
-        # Track a buildings stored resources
+        # Track a buildings stored resources in the economy arrays
+        world.economy.add(self)
         self.electricity = 0
         self.water = 0
 
@@ -92,49 +106,29 @@ class Factory(Buildings):
         self.worker_max_capacity = 5
         self.worker_count_current = 0
 
-        # Cooldowns for resource generation and consumption
-        self.production_cooldown = pg.time.get_ticks()
-        self.consumption_cooldown = pg.time.get_ticks()
-
         # Resource consumption rates per second
         self.electricity_consumption = self.resources.consumption["factory"]["electricity"]
         self.water_consumption = self.resources.consumption["factory"]["water"]
 
-        # Production rates per second
-        self.thugoleon_production_rate = (self.resources.production["factory"]["thugoleons"] / self.worker_max_capacity * self.worker_count_current) + 500
+        # Production rates per second, set from worker_count_current by the economy
+        self.thugoleon_production_per_worker = self.resources.production["factory"]["thugoleons"] // self.worker_max_capacity
+        self.thugoleon_production_rate = 0
 
         # Store adjacent road position
         self.adjacent_road = None
         if world and grid_pos:
             self.find_adjacent_road(world, grid_pos)
 
-    def update(self):
-        now = pg.time.get_ticks()
-
-        # Production of thugoleons every second
-        if now - self.production_cooldown >= 1000:
-            self.thugoleon_production_rate = self.resources.production["factory"]["thugoleons"] / self.worker_max_capacity * self.worker_count_current
-            if (self.check_has_resources()):
-                    self.resource_manager.resources["thugoleons"] += self.thugoleon_production_rate
-                    self.production_cooldown = now
-
-        # Consumption of resources every second
-        if now - self.consumption_cooldown >= 1000:
-            # Only consume if there are enough resources
-            if (self.check_has_resources()):
-                self.electricity -= self.electricity_consumption
-                self.resource_manager.resources["electricity"] -= self.electricity_consumption
-                self.water -= self.water_consumption
-                self.resource_manager.resources["water"] -= self.water_consumption
-                self.consumption_cooldown = now
-
-    def check_has_resources(self):
-        return (self.electricity >= self.electricity_consumption and
-                self.water >= self.water_consumption)
-
 class Residential_Building(Buildings):
+    # stored in the economy arrays
+    electricity = EconomyField("electricity")
+    water = EconomyField("water")
+    electricity_consumption = EconomyField("electricity_consumption")
+    water_consumption = EconomyField("water_consumption")
+    thugoleon_production_rate = EconomyField("thugoleon_production_rate")
+
     def __init__(self, pos, resource_manager, world=None, grid_pos=None):
-        image = pg.image.load("assets/graphics/residential_building.png")
+        image = assets.sprite("assets/graphics/residential_building.png")
         self.image = image
         resources = Buildings()
         self.name = "residential_building"
@@ -144,14 +138,11 @@ class Residential_Building(Buildings):
         # Get warning image from instance of building class
         self.warning_image = resources.warning_image
 
-        # Track a buildings stored resources
+        # Track a buildings stored resources in the economy arrays
+        world.economy.add(self)
         self.electricity = 0
         self.water = 0
 
-        # Cooldowns for resource generation and consumption
-        self.production_cooldown = pg.time.get_ticks()
-        self.consumption_cooldown = pg.time.get_ticks()
-
         # Resource consumption rates per second
         self.electricity_consumption = resources.consumption["residential_building"]["electricity"]
         self.water_consumption = resources.consumption["residential_building"]["water"]
@@ -170,33 +161,16 @@ class Residential_Building(Buildings):
                 # Pass the grid position of the residential building as home_tile
                 Citizen(road_tile, world)
 
-    def update(self):
-        now = pg.time.get_ticks()
-
-        # Production of thugoleons every second
-        if now - self.production_cooldown >= 1000:
-            if (self.check_has_resources()):
-                    self.resource_manager.resources["thugoleons"] += self.thugoleon_production_rate
-                    self.production_cooldown = now
-
-        # Consumption of resources every second
-        if now - self.consumption_cooldown >= 1000:
-            # Only consume if there are enough resources
-            if (self.check_has_resources()):
-                self.electricity -= self.electricity_consumption
-                self.resource_manager.resources["electricity"] -= self.electricity_consumption
-                self.water -= self.water_consumption
-                self.resource_manager.resources["water"] -= self.water_consumption
-                self.consumption_cooldown = now
-
-    def check_has_resources(self):
-        return (self.electricity >= self.electricity_consumption and
-                self.water >= self.water_consumption)
-
-
 class Solar_Panels(Buildings):
+    # stored in the economy arrays
+    electricity = EconomyField("electricity")
+    water = EconomyField("water")
+    water_consumption = EconomyField("water_consumption")
+    thugoleon_consumption = EconomyField("thugoleon_consumption")
+    electricity_production_rate = EconomyField("electricity_production_rate")
+
     def __init__(self, pos, resource_manager, world, grid_pos):
-        image = pg.image.load("assets/graphics/solar_panels.png")
+        image = assets.sprite("assets/graphics/solar_panels.png")
         self.image = image
         resources = Buildings()
         self.name = "solar_panels"
@@ -207,14 +181,11 @@ class Solar_Panels(Buildings):
         # Get warning image from instance of building class
         self.warning_image = resources.warning_image
 
-        # Track a buildings stored resources
+        # Track a buildings stored resources in the economy arrays
+        world.economy.add(self)
         self.electricity = 0 # start with 0 electricity
         self.water = 0
 
-        # Cooldowns for resource generation and consumption
-        self.production_cooldown = pg.time.get_ticks()
-        self.consumption_cooldown = pg.time.get_ticks()
-
         # Resource consumption rates per second
         self.water_consumption = resources.consumption["solar_panels"]["water"]
         self.thugoleon_consumption = resources.consumption["solar_panels"]["thugoleons"]
@@ -233,32 +204,16 @@ class Solar_Panels(Buildings):
                 # Pass the grid position of the residential building as home_tile
                 ResourceAgent(self.name, grid_pos, road_tile, world, "electricity")
 
-    def update(self):
-        now = pg.time.get_ticks()
-
-        # Production of resources every second
-        if now - self.production_cooldown >= 1000:
-            if (self.check_has_resources()):
-                    self.electricity += self.electricity_production_rate
-                    self.resource_manager.resources["electricity"] += self.electricity_production_rate
-                    self.production_cooldown = now
-
-        # Consumption of resources every second
-        if now - self.consumption_cooldown >= 1000:
-            # Only consume if there are enough resources
-            if (self.check_has_resources()):
-                self.water -= self.water_consumption
-                self.resource_manager.resources["water"] -= self.water_consumption
-                self.resource_manager.resources["thugoleons"] -= self.thugoleon_consumption
-                self.consumption_cooldown = now
-
-    def check_has_resources(self):
-        return (self.water >= self.water_consumption and
-                self.resource_manager.resources["thugoleons"] >= self.thugoleon_consumption)
-
 class Water_Treatment_Plant(Buildings):
+    # stored in the economy arrays
+    electricity = EconomyField("electricity")
+    water = EconomyField("water")
+    electricity_consumption = EconomyField("electricity_consumption")
+    thugoleon_consumption = EconomyField("thugoleon_consumption")
+    water_production_rate = EconomyField("water_production_rate")
+
     def __init__(self, pos, resource_manager, world, grid_pos):
-        image = pg.image.load("assets/graphics/water_treatment_plant.png")
+        image = assets.sprite("assets/graphics/water_treatment_plant.png")
         self.image = image
         resources = Buildings()
         self.name = "water_treatment_plant"
@@ -269,11 +224,8 @@ class Water_Treatment_Plant(Buildings):
         # Get warning image from instance of building class
         self.warning_image = resources.warning_image
 
-        # Cooldowns for resource generation and consumption
-        self.production_cooldown = pg.time.get_ticks()
-        self.consumption_cooldown = pg.time.get_ticks()
-
-        # Track a buildings stored resources
+        # Track a buildings stored resources in the economy arrays
+        world.economy.add(self)
         self.electricity = 0
         self.water = 0 # start with 0 water
 
@@ -294,26 +246,3 @@ class Water_Treatment_Plant(Buildings):
                 road_tile = world.world[self.adjacent_road[0]][self.adjacent_road[1]]
                 # Pass the grid position of the residential building as home_tile
                 ResourceAgent(self.name, grid_pos, road_tile, world, "water")
-
-    def update(self):
-        now = pg.time.get_ticks()
-
-        # Production of resources every second
-        if now - self.production_cooldown >= 1000:
-            if (self.check_has_resources()):
-                    self.water += self.water_production_rate
-                    self.resource_manager.resources["water"] += self.water_production_rate
-                    self.production_cooldown = now
-
-        # Consumption of resources every second
-        if now - self.consumption_cooldown >= 1000:
-            # Only consume if there are enough resources
-            if (self.check_has_resources()):
-                self.electricity -= self.electricity_consumption
-                self.resource_manager.resources["electricity"] -= self.electricity_consumption
-                self.resource_manager.resources["thugoleons"] -= self.thugoleon_consumption
-                self.consumption_cooldown = now
-
-    def check_has_resources(self):
-        return (self.electricity >= self.electricity_consumption and
-                self.resource_manager.resources["thugoleons"] >= self.thugoleon_consumption)
@@ -12,8 +12,8 @@ class Camera:
         self.dy = 0
         self.scroll_x_Max = 1700  # Max scroll distance in x direction
         self.scroll_y_Max = 1000 # Max scroll distance in x direction
-        self.scroll_x_Min = -3600  # Min scroll distance in x direction
-        self.scroll_y_Min = -1800  # Min scroll distance in x direction
+        self.scroll_x_Min = TILE_SIZE*WORLD_SIZE*-1.875  # Min scroll distance in x direction
+        self.scroll_y_Min = TILE_SIZE*WORLD_SIZE*-0.9375  # Min scroll distance in x direction
         self.max_speed = CAMERA_SPEED  # Max speed at edge
 
     def update(self):
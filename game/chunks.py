@@ -0,0 +1,144 @@
+import pygame as pg
+from collections import OrderedDict
+from .settings import TILE_SIZE, CHUNK_SIZE, CHUNK_CACHE_SIZE
+
+FLAT_TILES = ("mud", "water") # terrain that lies flat on the ground and never covers a sprite behind it
+
+class TerrainChunks:
+    def __init__(self, world):
+        """Flat terrain (ground, mud, water) pre-baked into chunks of CHUNK_SIZE x CHUNK_SIZE tiles, trees and rocks are drawn with the sprites"""
+        self.world = world
+        self.chunks_x = (world.grid_length_x + CHUNK_SIZE - 1) // CHUNK_SIZE
+        self.chunks_y = (world.grid_length_y + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+        # (chunk rect, ground surface, water rect, water layer per animation frame) by chunk coordinate, least recently drawn first
+        self.surfaces = OrderedDict()
+
+        # statistics for performance tracking
+        self.bakes = 0
+        self.blits = 0
+
+    def chunk_of(self, grid_pos):
+        """Returns the chunk coordinate a tile belongs to"""
+        return grid_pos[0] // CHUNK_SIZE, grid_pos[1] // CHUNK_SIZE
+
+    def tile_range(self, chunk):
+        """Returns the (x_start, x_end, y_start, y_end) tile range of a chunk"""
+        x_start = chunk[0] * CHUNK_SIZE
+        y_start = chunk[1] * CHUNK_SIZE
+        return (x_start, min(x_start + CHUNK_SIZE, self.world.grid_length_x),
+                y_start, min(y_start + CHUNK_SIZE, self.world.grid_length_y))
+
+    def chunk_rect(self, chunk):
+        """Returns the area covered by a chunk in world render coordinates"""
+        x_start, x_end, y_start, y_end = self.tile_range(chunk)
+        left = (x_start - y_end) * TILE_SIZE + self.world.render_offset_x
+        right = (x_end - 1 - y_start) * TILE_SIZE + self.world.render_offset_x + TILE_SIZE
+        top = (x_start + y_start) * TILE_SIZE / 2
+        bottom = (x_end + y_end - 2) * TILE_SIZE / 2 + 2 * TILE_SIZE
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def bake(self, chunk):
+        """Bakes the ground of a chunk once, and its water tiles once per animation frame on layers cropped to them"""
+        rect = self.chunk_rect(chunk)
+        tiles = self.baked_tiles(chunk)
+        ground = self.bake_ground(chunk, rect, tiles)
+        # the water tiles, and the mud drawn after them over their edges or over mud that is
+        water_rects = []
+        layer_rects = []
+        layer_tiles = []
+        for grid_pos in tiles:
+            tile = self.world.world[grid_pos[0]][grid_pos[1]]["tile"]
+            tile_rect = self.tile_rect(grid_pos, rect)
+            if tile == "water":
+                water_rects.append(tile_rect)
+            elif tile not in FLAT_TILES or tile_rect.collidelist(layer_rects) == -1:
+                continue
+            layer_rects.append(tile_rect)
+            layer_tiles.append((grid_pos, tile))
+        water_rect = None
+        layers = []
+        if water_rects:
+            water_rect = water_rects[0].unionall(water_rects[1:]).clip(ground.get_rect())
+            layers = [self.bake_water(layer_tiles, water_rect, rect, ground, water_frame) for water_frame in self.world.water_frames]
+        self.bakes += 1
+        return rect, ground, water_rect, layers
+
+    def tile_rect(self, grid_pos, rect):
+        """Returns the area of a tile's flat sprite within the surface of a chunk"""
+        render_pos = self.world.world[grid_pos[0]][grid_pos[1]]["render_pos"]
+        return pg.Rect(render_pos[0] + self.world.render_offset_x - rect.x, render_pos[1] - rect.y, 2 * TILE_SIZE, 2 * TILE_SIZE)
+
+    def baked_tiles(self, chunk):
+        """Returns the tiles whose sprites are baked into a chunk, in the order the world is drawn in"""
+        # the chunk's own tiles, plus the neighbouring tiles of earlier chunks that hang over its ground
+        x_start, x_end, y_start, y_end = self.tile_range(chunk)
+        tiles = []
+        for x in range(max(0, x_start - 1), min(self.world.grid_length_x, x_end + 1)):
+            for y in range(max(0, y_start - 1), min(self.world.grid_length_y, y_end + 1)):
+                if self.chunk_of((x, y)) <= chunk:
+                    tiles.append((x, y))
+        return tiles
+
+    def bake_ground(self, chunk, rect, tiles):
+        """Renders the ground and mud of a chunk onto a single surface"""
+        surface = pg.Surface(rect.size, pg.SRCALPHA).convert_alpha()
+        x_start, x_end, y_start, y_end = self.tile_range(chunk)
+        offset_x = self.world.render_offset_x - rect.x
+        offset_y = -rect.y
+
+        for x in range(x_start, x_end):
+            for y in range(y_start, y_end):
+                render_pos = self.world.world[x][y]["render_pos"]
+                surface.blit(self.world.tiles["block"], (render_pos[0] + offset_x, render_pos[1] + offset_y))
+
+        for x, y in tiles:
+            tile = self.world.world[x][y]["tile"]
+            if tile in FLAT_TILES and tile != "water":
+                image = self.world.tiles[tile]
+                render_pos = self.world.world[x][y]["render_pos"]
+                surface.blit(image, (render_pos[0] + offset_x,
+                                     render_pos[1] - (image.get_height() - 2 * TILE_SIZE) + offset_y))
+
+        # run-length encoding skips the transparent corners and opaque runs quickly when blitting
+        surface.set_alpha(255, pg.RLEACCEL)
+        return surface
+
+    def bake_water(self, layer_tiles, water_rect, rect, ground, water_frame):
+        """Renders one animation frame of the water tiles of a chunk, drawn over its ground"""
+        # starting from the ground below blends the soft edges of the water as drawing it onto the ground would
+        surface = ground.subsurface(water_rect).copy()
+        for grid_pos, tile in layer_tiles:
+            image = water_frame if tile == "water" else self.world.tiles[tile]
+            tile_rect = self.tile_rect(grid_pos, rect)
+            surface.blit(image, (tile_rect.x - water_rect.x, tile_rect.y - water_rect.y))
+        surface.set_alpha(255, pg.RLEACCEL)
+        return surface
+
+    def visible_chunks(self, columns):
+        """Returns the chunks covering the visible (x, y_start, y_end) tile columns, in drawing order"""
+        chunks = set()
+        for x, y_start, y_end in columns:
+            for chunk_y in range(y_start // CHUNK_SIZE, (y_end - 1) // CHUNK_SIZE + 1):
+                chunks.add((x // CHUNK_SIZE, chunk_y))
+        return sorted(chunks)
+
+    def blit_list(self, camera, columns):
+        """Returns the (surface, position) pairs of every visible chunk at the current water animation frame, baking the ones that are missing"""
+        self.blits = 0
+        blits = []
+        for chunk in self.visible_chunks(columns):
+            if chunk not in self.surfaces:
+                self.surfaces[chunk] = self.bake(chunk)
+            self.surfaces.move_to_end(chunk)
+            rect, ground, water_rect, layers = self.surfaces[chunk]
+            blits.append((ground, (rect.x + camera.scroll.x, rect.y + camera.scroll.y)))
+            if layers:
+                layer = layers[self.world.animation_frame % len(layers)]
+                blits.append((layer, (rect.x + water_rect.x + camera.scroll.x, rect.y + water_rect.y + camera.scroll.y)))
+            self.blits += 1
+
+        # forget the chunks that have been off screen the longest
+        while len(self.surfaces) > CHUNK_CACHE_SIZE:
+            self.surfaces.popitem(last=False)
+        return blits
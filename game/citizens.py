@@ -1,19 +1,21 @@
 import pygame as pg
 import random
-from pathfinding.core.diagonal_movement import DiagonalMovement
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
+from .assets import assets
+from .settings import SCHEDULE_WINDOW
 
 class Citizen:
+    schedule_hours = (7, 16, 20) # hours at which schedule() changes what the citizen does
+
     def __init__(self, tile, world):
         """Initialize a citizen object."""
         self.world = world
         self.world.entities.append(self) # add itself to entities for updating
+        self.world.scheduler.add(self)
+        self.world.jobs.add_citizen(self)
 
         #randomize which out of 5 images to use
-        image = pg.image.load(f"assets/graphics/citizen{random.randint(1, 5)}.png").convert_alpha()
+        self.image = assets.sprite(f"assets/graphics/citizen{random.randint(1, 5)}.png", 2)
         self.name = f"citizen_{random.randint(1, 1000)}"
-        self.image = pg.transform.scale(image, (image.get_width()*2, image.get_height()*2))
         self.tile = tile
 
         # pathfinding
@@ -25,9 +27,6 @@ class Citizen:
         self.target_pos = pg.Vector2(tile["render_pos"][0], tile["render_pos"][1])
         self.is_moving = False
 
-        # Initialize a placeholder grid for the initial path creation
-        self.grid = Grid(matrix=self.world.collision_matrix)
-
         # initialize schedule variables
         self.home_grid_pos = tile["grid"]
         self.workplace = None
@@ -39,105 +38,54 @@ class Citizen:
         self.wandering = False
 
         # movement and schedule timers
-        self.move_timer = pg.time.get_ticks()
+        self.move_timer = self.world.clock.get_ticks()
         self.last_hour_checked = - 1
+        self.pending_hour = None # schedule change waiting for its departure time
+        self.departure_time = 0
+        self.stranded = False # no path anywhere from here, waits for a road to be added
 
         self.create_path(tile["grid"])
 
     def pathfinder(self, x, y, origin):
-        # Check if the factory is reachable for the citizen
-        road_tiles = []
-        for i in range(self.world.grid_length_x):
-            for j in range(self.world.grid_length_y):
-                # Check if tile has a road on it
-                if self.world.roads[i][j] is not None:
-                    road_tiles.append((i, j))
-
-        # Create temporary collision matrix
-        temp_collision_matrix = [row[:] for row in self.world.collision_matrix]
-
-        # Mark all non-road tiles as non-walkable
-        for i in range(self.world.grid_length_x):
-            for j in range(self.world.grid_length_y):
-                if self.world.roads[i][j] is None:
-                    temp_collision_matrix[j][i] = 0
-
-        # Exception for current citizen's position
-        current_pos = self.tile["grid"]
-        temp_collision_matrix[current_pos[1]][current_pos[0]] = 1
-
-        self.grid = Grid(matrix=temp_collision_matrix) # collision matrix
-        self.start = self.grid.node(self.tile["grid"][0], self.tile["grid"][1])
-        self.end = self.grid.node(x, y) # destination
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.never)
-        path, runs = finder.find_path(self.start, self.end, self.grid)
-        return [path, runs]
+        # the road network keeps one road-only grid and reuses the paths found on it until the roads change
+        return self.world.road_network.find_path(self.tile["grid"], (x, y))
 
 
     def find_workplace(self):
-        """Find a factory to work at, prioritizing factories with the lowest worker count"""
-        factories = []
-        # Look for all factories in the world
-        for x in range(self.world.grid_length_x):
-            for y in range(self.world.grid_length_y):
-                building = self.world.buildings[x][y]
-                if building is not None and building.name == "factory":
-                    if building.adjacent_road:
-                        # Store factory, its position, the adjacent road position, and worker count
-                        factories.append((building, (x, y), building.adjacent_road, building.worker_count))
-
-        # If the citizen already has a workplace, update the previous workplace's worker count
-        if self.workplace is not None:
-            self.workplace.worker_count = max(0, self.workplace.worker_count - 1)
-
-        if factories:
-            # Sort factories by worker count (lowest first)
-            factories.sort(key=lambda f: f[3])
-            # Choose the factory with the lowest worker count
-            self.workplace, workplace_pos, self.workplace_grid_pos, _ = factories[0]
-
-            path, runs = self.pathfinder(self.workplace_grid_pos[0], self.workplace_grid_pos[1], self.tile["grid"])
-
-            if len(path) > 0: # if path is valid
-                # print(f"{self.name} valid path to workplace of length {len(path)}")
-                if self.workplace.worker_count < self.workplace.worker_max_capacity:
-                    self.workplace.worker_count += 1
-                else:
-                    self.workplace, self.workplace_grid_pos = None, None
-            else:
-                print(f"{self.name} has no valid path to workplace {self.workplace_grid_pos}")
-                self.workplace, self.workplace_grid_pos = None, None
-        else:
-            # If no factory exists, citizen won't have a workplace
-            self.workplace = None
-            self.workplace_grid_pos = None
+        """Keep the current workplace or get one from the job market, which picks a reachable factory with open slots"""
+        self.world.jobs.find_job(self)
 
     def create_path(self, destination):
         """Create a path to the destination tile or a random one if no destination is set"""
-        # find road tiles
-        road_tiles = []
-        for i in range(self.world.grid_length_x):
-            for j in range(self.world.grid_length_y):
-                # Check if tile has a road on it
-                if self.world.roads[i][j] is not None:
-                    road_tiles.append((i, j))
-        # If no road tiles are available, stay in place
-        if road_tiles is None:
-            self.change_tile(self.tile) # stay in place
-
         if destination is not None:
             x, y = destination # set the x and y coordinates to the destination
-        else:
+        elif self.world.registry.road_tiles:
             # Choose a random road tile as destination
-            x, y = random.choice(road_tiles)
+            x, y = random.choice(self.world.registry.road_tiles)
+        else:
+            return # If no road tiles are available, stay in place
 
-        path, runs = self.pathfinder(x, y, self.tile["grid"])
+        path = self.pathfinder(x, y, self.tile["grid"])
 
         if len(path) > 0: # if path is valid
             self.path_index = 0
             self.path = path
+            self.stranded = False
+            self.world.paths.track(self)
             return
 
+    def replan(self, destination):
+        """Plans around a removed road, wanders off if the destination can't be reached anymore and waits for the roads to change if nothing can"""
+        path = self.path
+        self.create_path(destination)
+        if self.path is path:
+            self.create_path(None)
+        if self.path is path:
+            self.path = []
+            self.path_index = 0
+            self.stranded = True
+            self.world.paths.strand(self, destination)
+
     def change_tile(self, new_tile):
         current_grid_pos = self.tile["grid"]
         # Remove citizen from current tile
@@ -172,8 +120,9 @@ class Citizen:
                     self.create_path(None)
             case 16: # at 16 leave work and start wandering around
                 self.at_work = False
-                if self.workplace:
+                if self.workplace and self.contributed_to_worker_count:
                     self.workplace.worker_count_current -= 1
+                    self.contributed_to_worker_count = False
                 self.is_visible = True # make the citizen visible
                 self.wandering = True # set the wandering flag to True
                 self.create_path(None) # create a path with no destination
@@ -183,13 +132,22 @@ class Citizen:
                 self.create_path(self.home_grid_pos)
 
     def update(self):
-        now = pg.time.get_ticks()
-        game_time = self.world.hud.game_time
+        """Moves the citizen and follows its schedule, returns the milliseconds until it needs the next update"""
+        now = self.world.clock.get_ticks()
+        game_time = self.world.clock.hour
 
         # only process schedule when the hour changes
         if game_time != self.last_hour_checked:
             self.last_hour_checked = game_time
-            self.schedule(game_time)
+            if game_time in self.schedule_hours:
+                # leave at a random moment of the window so the whole city doesn't change plans on one step
+                self.pending_hour = game_time
+                self.departure_time = now + random.randint(0, SCHEDULE_WINDOW)
+
+        # the schedule change searches for a workplace and a path, only a few run per frame
+        if self.pending_hour is not None and now >= self.departure_time and self.world.scheduler.take_work():
+            self.schedule(self.pending_hour)
+            self.pending_hour = None
 
         # Handle movement interpolation
         if self.is_moving:
@@ -212,13 +170,17 @@ class Citizen:
                     self.change_tile(new_pos)
                     # print(f"Path of length {len(self.path)}, done {self.path_index}")
                     self.path_index += 1
+                elif new_pos == self.tile["grid"]:
+                    # the path starts where the entity stands, on a road that has been removed since
+                    self.path_index += 1
                 else:
-                    # If destination has no road, find new path
-                    self.create_path(None)
+                    # the road was removed before the path index re-planned this path
+                    end = self.path[len(self.path) - 1]
+                    self.replan((end.x, end.y))
                 self.move_timer = now
 
-            # Reaching destination
-            if self.path_index == len(self.path):
+            # Reaching destination, a stranded citizen hasn't arrived anywhere
+            if self.path_index == len(self.path) and not self.stranded:
                 if self.wandering: # if the citizen is wandering, create a new random path
                     self.create_path(None)
                 elif not self.is_moving:
@@ -226,3 +188,14 @@ class Citizen:
                     if self.at_work and self.workplace and not self.contributed_to_worker_count:
                         self.workplace.worker_count_current += 1
                         self.contributed_to_worker_count = True
+
+        # interpolate on every step while moving
+        if self.is_moving:
+            return 0
+        next_update = self.world.clock.until_next_hour()
+        if self.pending_hour is not None:
+            next_update = min(next_update, self.departure_time - now)
+        # arrived and hidden or stranded, nothing happens until the schedule or the roads change
+        if self.stranded or (self.path_index == len(self.path) and not self.wandering and not self.is_visible):
+            return next_update
+        return min(self.move_timer + 501 - now, next_update) # next step along the path
@@ -0,0 +1,32 @@
+import math
+
+class SimClock:
+    def __init__(self, start_hour=12, hour_duration=5000):
+        """Simulated time shared by everything that runs the city, independent of the display and frame rate"""
+        self.start_hour = start_hour
+        self.hour_duration = hour_duration  # milliseconds of simulated time for 1 in-game hour
+
+        self.ticks = 0  # milliseconds of simulated time since the start
+        self.dt = 0  # milliseconds simulated by the last step
+        self.time_of_day = start_hour  # in-game hour including its fraction
+        self.hour = start_hour  # in-game hour (0-23)
+
+    def advance(self, dt):
+        """Moves the simulation forward by dt milliseconds"""
+        self.dt = dt
+        self.ticks += dt
+        self.time_of_day = (self.start_hour + self.ticks / self.hour_duration) % 24
+        self.hour = int(self.time_of_day)
+
+    def until_next_hour(self):
+        """Milliseconds of simulated time until the in-game hour changes"""
+        hours = self.start_hour + self.ticks / self.hour_duration
+        return (math.floor(hours) + 1 - self.start_hour) * self.hour_duration - self.ticks
+
+    def get_ticks(self):
+        """Milliseconds of simulated time, replaces pg.time.get_ticks for simulation timers"""
+        return self.ticks
+
+    def get_time(self):
+        """Milliseconds simulated by the last step, replaces pg.time.Clock.get_time for movement"""
+        return self.dt
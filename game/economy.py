@@ -0,0 +1,138 @@
+import numpy as np
+from .settings import ECONOMY_TICK
+
+# stock, rates and counters kept for every building, one array of each per building type
+FIELDS = [
+    "electricity", "water",
+    "electricity_consumption", "water_consumption", "thugoleon_consumption",
+    "thugoleon_production_rate", "electricity_production_rate", "water_production_rate",
+    "thugoleon_production_per_worker", "worker_count_current",
+]
+
+class EconomyField:
+    def __init__(self, field):
+        """Building attribute stored in the economy arrays instead of on the building"""
+        self.field = field
+
+    def __get__(self, building, owner=None):
+        if building is None:
+            return self
+        return building.economy.tables[building.name].data[self.field][building.economy_index].item()
+
+    def __set__(self, building, value):
+        building.economy.tables[building.name].data[self.field][building.economy_index] = value
+
+class EconomyTable:
+    def __init__(self, capacity=16):
+        """Rows of every building of one type"""
+        self.data = {field: np.zeros(capacity, dtype=np.int64) for field in FIELDS}
+        self.active = np.zeros(capacity, dtype=bool)
+        self.has_resources = np.zeros(capacity, dtype=bool)  # result of the last economy tick
+        self.size = 0  # rows in use, including freed ones
+        self.free = []
+
+    def add(self):
+        """Returns the index of a new zeroed row"""
+        if self.free:
+            index = self.free.pop()
+        else:
+            if self.size == len(self.active):
+                # double the capacity
+                self.data = {field: np.concatenate([values, np.zeros_like(values)]) for field, values in self.data.items()}
+                self.active = np.concatenate([self.active, np.zeros_like(self.active)])
+                self.has_resources = np.concatenate([self.has_resources, np.zeros_like(self.has_resources)])
+            index = self.size
+            self.size += 1
+        self.active[index] = True
+        return index
+
+    def remove(self, index):
+        """Frees a row for reuse"""
+        for values in self.data.values():
+            values[index] = 0
+        self.active[index] = False
+        self.has_resources[index] = False
+        self.free.append(index)
+
+class Economy:
+    def __init__(self, resource_manager, clock):
+        """Production and consumption of every building, run for all buildings at once every ECONOMY_TICK"""
+        self.resource_manager = resource_manager
+        self.clock = clock
+        self.last_tick = clock.get_ticks()
+
+        self.tables = {
+            "factory": EconomyTable(),
+            "residential_building": EconomyTable(),
+            "solar_panels": EconomyTable(),
+            "water_treatment_plant": EconomyTable(),
+        }
+
+    def add(self, building):
+        """Gives a building its row, the building only keeps the index"""
+        building.economy = self
+        building.economy_index = self.tables[building.name].add()
+
+    def remove(self, building):
+        self.tables[building.name].remove(building.economy_index)
+
+    def update(self):
+        """Runs an economy tick once every ECONOMY_TICK of simulated time"""
+        now = self.clock.get_ticks()
+        if now - self.last_tick >= ECONOMY_TICK:
+            self.tick()
+            self.last_tick = now
+
+    def tick(self):
+        """One second of production and consumption for every building"""
+        resources = self.resource_manager.resources
+        thugoleons = resources["thugoleons"]
+        produced = {"thugoleons": 0, "electricity": 0, "water": 0}
+        consumed = {"thugoleons": 0, "electricity": 0, "water": 0}
+
+        for table in self.tables.values():
+            n = table.size
+            data = {field: values[:n] for field, values in table.data.items()}
+            # buildings paid per worker produce for the workers present
+            per_worker = data["thugoleon_production_per_worker"] > 0
+            data["thugoleon_production_rate"][per_worker] = (data["thugoleon_production_per_worker"] * data["worker_count_current"])[per_worker]
+
+            # a building works if it has stock for each of its consumptions
+            has_resources = (table.active[:n] &
+                             ((data["electricity_consumption"] == 0) | (data["electricity"] >= data["electricity_consumption"])) &
+                             ((data["water_consumption"] == 0) | (data["water"] >= data["water_consumption"])))
+            # thugoleons come from the city, paid in row order, a building that can't be paid leaves the rest for the next ones
+            thugoleon_cost = np.where(has_resources, data["thugoleon_consumption"], 0)
+            total_cost = thugoleon_cost.sum()
+            if total_cost <= thugoleons:
+                thugoleons -= total_cost
+            else:
+                for index in np.flatnonzero(thugoleon_cost).tolist():
+                    if thugoleon_cost[index] <= thugoleons:
+                        thugoleons -= thugoleon_cost[index]
+                    else:
+                        has_resources[index] = False
+            # the tables after this one can spend what it earns, like the buildings after it did in the per-building update
+            thugoleons += np.where(has_resources, data["thugoleon_production_rate"], 0).sum()
+            table.has_resources[:n] = has_resources
+
+            # production
+            electricity_production = np.where(has_resources, data["electricity_production_rate"], 0)
+            water_production = np.where(has_resources, data["water_production_rate"], 0)
+            data["electricity"] += electricity_production
+            data["water"] += water_production
+            produced["electricity"] += electricity_production.sum()
+            produced["water"] += water_production.sum()
+            produced["thugoleons"] += np.where(has_resources, data["thugoleon_production_rate"], 0).sum()
+
+            # consumption
+            electricity_consumption = np.where(has_resources, data["electricity_consumption"], 0)
+            water_consumption = np.where(has_resources, data["water_consumption"], 0)
+            data["electricity"] -= electricity_consumption
+            data["water"] -= water_consumption
+            consumed["electricity"] += electricity_consumption.sum()
+            consumed["water"] += water_consumption.sum()
+            consumed["thugoleons"] += np.where(has_resources, data["thugoleon_consumption"], 0).sum()
+
+        for resource in produced:
+            resources[resource] += int(produced[resource] - consumed[resource])
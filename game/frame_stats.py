@@ -0,0 +1,15 @@
+class FrameStats:
+    def __init__(self, hours):
+        """Worst frame time seen during each of the given in-game hours"""
+        self.hours = hours
+        self.worst = {}  # hour -> milliseconds
+
+    def record(self, hour, milliseconds):
+        if hour in self.hours and milliseconds > self.worst.get(hour, 0):
+            self.worst[hour] = milliseconds
+
+    def report(self):
+        """Summary for debug output"""
+        if not self.worst:
+            return "Worst frame: no transition hours seen"
+        return "Worst frame: " + ", ".join(f"{hour}:00 {self.worst[hour]:.1f} ms" for hour in sorted(self.worst))
@@ -2,79 +2,158 @@ import pygame as pg
 import sys
 import time
 from .world import World
-from .settings import WORLD_SIZE, TEXT_SIZE
-from .utils import draw_text
+from .settings import WORLD_SIZE, TEXT_SIZE, DIRTY_RECTS, DIRTY_RECT_LIMIT, DIRTY_RECT_AREA, SIM_TICK, SIM_SPEEDS, MAX_SIM_STEPS
+from .utils import draw_text, merge_rects
 from .camera import Camera
 from .hud import Hud
 from .resource_manager import ResourceManager
 from .buildings import Buildings
+from .assets import assets
+from .clock import SimClock
+from .citizens import Citizen
+from .frame_stats import FrameStats
 
 class Game:
-    def __init__(self, screen, clock):
+    def __init__(self, screen, clock, seed=None):
         self.screen = screen
         self.clock = clock
         self.width, self.height = screen.get_size()
         self.buildings = Buildings()
         self.entities = []
         self.resource_manager = ResourceManager()
+        assets.preload()
 
-        # In-game clock (24-hour format)
-        self.game_time = 12  # starting hour
-        self.real_time_last_hour = time.time()  # to track when to increase the hour
-        self.hour_duration = 5  # seconds in real time for 1 in-game hour
+        # In-game clock (24-hour format), 5 seconds of simulated time for 1 in-game hour
+        self.sim_clock = SimClock(start_hour=12, hour_duration=5000)
+        self.sim_speed = SIM_SPEEDS[0]
+        self.paused = False
+        self.sim_time_pending = 0  # frame time not simulated yet, in milliseconds
 
         self.hud = Hud(self.resource_manager,self.width, self.height)
-        self.world = World(self.buildings, self.resource_manager, self.entities, self.hud, self.clock, WORLD_SIZE, WORLD_SIZE, self.width, self.height)
+        self.world = World(self.buildings, self.resource_manager, self.entities, self.hud, self.sim_clock, WORLD_SIZE, WORLD_SIZE, self.width, self.height, seed)
         self.camera = Camera(self.width, self.height, self.hud)
 
+        # dirty rectangle rendering, toggled with R
+        self.dirty_rects = DIRTY_RECTS
+
+        # worst frames while the citizens change their schedule
+        self.frame_stats = FrameStats(Citizen.schedule_hours)
+
 
     def run(self):
         self.playing = True
+        # the work budget covers a rendered frame however many steps the speed runs in it
+        self.world.scheduler.budget_per_step = False
         while self.playing:
             self.clock.tick(60)
+            frame_start = time.perf_counter()
+            self.world.scheduler.renew_budget()
             self.events()
             self.update()
             self.draw()
+            self.frame_stats.record(self.sim_clock.hour, (time.perf_counter() - frame_start) * 1000)
 
     def events(self):
         for event in pg.event.get():
             if event.type == pg.QUIT:
+                print(assets.report())
+                print(self.frame_stats.report())
                 pg.quit()
                 sys.exit()
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
+                    print(assets.report())
+                    print(self.frame_stats.report())
                     pg.quit()
                     sys.exit()
                 if event.key == pg.K_DELETE or event.key == pg.K_BACKSPACE: # toggle delete mode
                     self.hud.delete_mode = not self.hud.delete_mode
                 if event.key == pg.K_a: # toggle agent visibility
                     self.world.show_agents = not self.world.show_agents
+                if event.key == pg.K_SPACE: # pause or resume the simulation
+                    self.paused = not self.paused
+                if event.key in (pg.K_1, pg.K_2, pg.K_3): # simulation speed
+                    self.sim_speed = SIM_SPEEDS[event.key - pg.K_1]
+                if event.key == pg.K_r: # toggle dirty rectangle rendering
+                    self.dirty_rects = not self.dirty_rects
+                    self.world.last_frame_state = None
 
     def update(self):
-        # Update game clock
-        current_time = time.time()
-        if current_time - self.real_time_last_hour >= self.hour_duration:
-            self.game_time = (self.game_time + 1) % 24  # Loop back to 0 after 23
-            self.real_time_last_hour = current_time
-
-        # Pass the game time to the HUD
-        self.hud.game_time = self.game_time
+        # run as many fixed simulation steps as the elapsed frame time calls for at the current speed
+        if not self.paused:
+            self.sim_time_pending = min(self.sim_time_pending + self.clock.get_time() * self.sim_speed, MAX_SIM_STEPS * SIM_TICK)
+            while self.sim_time_pending >= SIM_TICK:
+                self.simulate(SIM_TICK)
+                self.sim_time_pending -= SIM_TICK
+        self.hud.sim_speed = 0 if self.paused else self.sim_speed
 
         self.camera.update()
-        for entity in self.entities: # update every entity on the list
-            entity.update()
         self.hud.update()
         self.world.update(self.clock, self.camera)
 
+    def simulate(self, dt):
+        """Advances the city by dt milliseconds, runs without a display or input"""
+        self.sim_clock.advance(dt)
+
+        # Pass the game time to the HUD
+        self.hud.game_time = self.sim_clock.hour
+        self.hud.time_of_day = self.sim_clock.time_of_day
+
+        # re-plan the paths that crossed a removed road, a few per step
+        self.world.paths.update()
+
+        # update the entities that are due
+        self.world.scheduler.update()
+
+        # hire the unemployed with the work budget the schedule changes left
+        self.world.jobs.update()
+
+        # send the agents that asked for a destination
+        self.world.logistics.update()
+
+        # production and consumption of every building at once
+        self.world.economy.update()
+
     def draw(self):
-        self.screen.fill((0, 0, 0))
-        self.world.draw(self.screen, self.camera)
+        self.world.prepare(self.screen, self.camera)
+        rects = self.changed_rects() if self.dirty_rects else None
+
+        if rects is None:
+            self.screen.fill((0, 0, 0))
+            self.draw_frame()
+            pg.display.flip()
+        elif rects:
+            # one pass clipped to each changed area, only the changed areas are pushed
+            for rect in rects:
+                self.screen.set_clip(rect)
+                self.screen.fill((0, 0, 0))
+                self.draw_frame()
+            self.screen.set_clip(None)
+            pg.display.update(rects)
+
+    def changed_rects(self):
+        """Screen areas that changed since the last frame, or None when the whole screen has to be redrawn"""
+        world_rects = self.world.changed_rects(self.camera)
+        hud_rects = self.hud.changed_rects(self.fps_text())
+        if world_rects is None or hud_rects is None:
+            return None
+        rects = merge_rects(world_rects + hud_rects, self.screen.get_rect())
+        # every area is a pass over the frame, past a few of them or a large share of the screen one full pass is cheaper
+        area = sum(rect.width * rect.height for rect in rects)
+        if len(rects) > DIRTY_RECT_LIMIT or area > DIRTY_RECT_AREA * self.width * self.height:
+            return None
+        return rects
+
+    def fps_text(self):
+        return "fps={}".format(round(self.clock.get_fps()))
+
+    def draw_frame(self):
+        self.world.render(self.screen, self.camera)
         self.hud.draw(self.screen)
 
         # Draw FPS counter
-        draw_text(self.screen,"fps={}".format(round(self.clock.get_fps())),TEXT_SIZE,(0,255,0),(15, 15))
+        draw_text(self.screen,self.fps_text(),TEXT_SIZE,(0,255,0),(15, 15))
 
         # camera scroll debug info
         # draw_text(self.screen,"camera position x={}".format(self.camera.scroll.x),25,(0,255,0),(15, 45))
         # draw_text(self.screen,"camera position y={}".format(self.camera.scroll.y),25,(0,255,0),(15, 75))
-        pg.display.flip()
@@ -0,0 +1,64 @@
+import time
+from .game import Game
+from .settings import SIM_TICK
+
+class Headless:
+    def __init__(self, screen, clock, seed, ticks):
+        """Runs the simulation of a generated city as fast as possible, without input or rendering"""
+        self.game = Game(screen, clock, seed)
+        self.world = self.game.world
+        self.ticks = ticks
+
+    def build_city(self):
+        """Lays out a grid of roads in the middle of the map and fills it with buildings, as far as the budget goes"""
+        world = self.world
+        x_start, x_end = world.grid_length_x // 6, world.grid_length_x - world.grid_length_x // 6
+        y_start, y_end = world.grid_length_y // 6, world.grid_length_y - world.grid_length_y // 6
+
+        # roads every third row, joined at both ends
+        for x in range(x_start, x_end):
+            for y in range(y_start, y_end):
+                if (y - y_start) % 3 == 0 or x in (x_start, x_end - 1):
+                    if world.can_place((x, y), "road"):
+                        world.place((x, y), "road")
+
+        lots = [(x, y) for x in range(x_start, x_end) for y in range(y_start, y_end)
+                if world.roads[x][y] is None and world.check_adjacent_roads((x, y), "factory")]
+
+        # utilities first: solar panels on the highest lot, a water treatment plant on the wettest mud lot
+        for name, key in [("solar_panels", "elevation"), ("water_treatment_plant", "moisture")]:
+            for grid_pos in sorted(lots, key=lambda pos: world.world[pos[0]][pos[1]][key], reverse=True):
+                if world.can_place(grid_pos, name):
+                    world.place(grid_pos, name)
+                    break
+
+        # then alternate homes and workplaces
+        names = ["residential_building", "factory"]
+        for grid_pos in lots:
+            for name in names:
+                if world.can_place(grid_pos, name):
+                    world.place(grid_pos, name)
+                    names.reverse()
+                    break
+
+    def run(self):
+        """Builds the city, simulates it and prints a throughput summary and the worst step of each schedule hour"""
+        self.build_city()
+        counts = {}
+        for entity in self.game.entities:
+            counts[type(entity).__name__] = counts.get(type(entity).__name__, 0) + 1
+        print(f"Seed {self.world.seed}, {len(self.game.entities)} entities: " +
+              ", ".join(f"{count} {name}" for name, count in sorted(counts.items())))
+
+        start = time.perf_counter()
+        for tick in range(self.ticks):
+            step_start = time.perf_counter()
+            self.game.simulate(SIM_TICK)
+            self.game.frame_stats.record(self.game.sim_clock.hour, (time.perf_counter() - step_start) * 1000)
+        elapsed = time.perf_counter() - start
+
+        sim_seconds = self.game.sim_clock.get_ticks() / 1000
+        print(f"Simulated {self.ticks} ticks ({sim_seconds:.0f} s, {sim_seconds * 1000 / self.game.sim_clock.hour_duration:.1f} in-game hours) "
+              f"in {elapsed:.2f} s: {self.ticks / elapsed:.0f} ticks/s, {sim_seconds / elapsed:.1f}x real time")
+        print("Resources: " + ", ".join(f"{resource} {value:.0f}" for resource, value in self.game.resource_manager.resources.items()))
+        print(self.game.frame_stats.report())
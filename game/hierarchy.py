@@ -0,0 +1,120 @@
+import heapq
+from .settings import CLUSTER_SIZE
+
+class ClusterGraph:
+    def __init__(self, network):
+        """Hierarchical pathfinding over the road network: paths are planned between cluster entrances and refined cluster by cluster"""
+        self.network = network
+        self.searches = {}  # cluster -> {entrance: (steps, parents) of a search inside the cluster}
+        self.dirty = set()  # clusters whose roads changed since their entrances were searched
+
+    def cluster(self, grid_pos):
+        return (grid_pos[0] // CLUSTER_SIZE, grid_pos[1] // CLUSTER_SIZE)
+
+    def changed(self, grid_pos):
+        """Marks the clusters a road edit affects, the tile's own and the ones whose entrances it touches"""
+        x, y = grid_pos
+        for tile in ((x, y), (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            self.dirty.add(self.cluster(tile))
+
+    def search(self, start, cluster):
+        """Steps and parents of every road tile reachable from start without leaving the cluster"""
+        steps = {start: 0}
+        parents = {start: None}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for tile in frontier:
+                for neighbor in self.network.neighbors(tile):
+                    if neighbor not in steps and self.cluster(neighbor) == cluster:
+                        steps[neighbor] = steps[tile] + 1
+                        parents[neighbor] = tile
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return steps, parents
+
+    def rebuild(self, cluster):
+        """Finds the entrances of a cluster, road tiles with a road just outside it, and searches from each of them"""
+        cluster_x, cluster_y = cluster
+        searches = {}
+        for x in range(cluster_x * CLUSTER_SIZE, (cluster_x + 1) * CLUSTER_SIZE):
+            for y in range(cluster_y * CLUSTER_SIZE, (cluster_y + 1) * CLUSTER_SIZE):
+                tile = (x, y)
+                if tile in self.network.labels and any(self.cluster(neighbor) != cluster for neighbor in self.network.neighbors(tile)):
+                    searches[tile] = self.search(tile, cluster)
+        self.searches[cluster] = searches
+
+    def entrances(self, cluster):
+        if cluster in self.dirty or cluster not in self.searches:
+            self.dirty.discard(cluster)
+            self.rebuild(cluster)
+        return self.searches[cluster]
+
+    def find_path(self, start, end):
+        """Road tiles from start to end, or an empty list, start may be off the roads"""
+        end_cluster = self.cluster(end)
+        searches = {}  # searches of the nodes that aren't entrances, the start or the tiles next to it
+
+        # A* over the entrances, edges are searches inside a cluster and single steps across a cluster border
+        # the goal is None, reached from any node in its cluster
+        costs = {start: 0}
+        came_from = {start: None}
+        queue = [(self.estimate(start, end), 0, 0, start)]  # (estimate, push order, cost, node)
+        pushed = 1
+        while queue:
+            estimate, order, cost, node = heapq.heappop(queue)
+            if node is None:
+                break
+            if cost > costs[node]:
+                continue
+            cluster = self.cluster(node)
+            steps = self.node_search(node, searches)[0]
+            edges = [(entrance, steps[entrance]) for entrance in self.entrances(cluster) if entrance in steps and entrance != node]
+            edges += [(neighbor, 1) for neighbor in self.network.neighbors(node) if self.cluster(neighbor) != cluster]
+            if cluster == end_cluster and end in steps:
+                edges.append((None, steps[end]))
+            for neighbor, step_cost in edges:
+                new_cost = cost + step_cost
+                if neighbor not in costs or new_cost < costs[neighbor]:
+                    costs[neighbor] = new_cost
+                    came_from[neighbor] = node
+                    heapq.heappush(queue, (new_cost + self.estimate(neighbor or end, end), pushed, new_cost, neighbor))
+                    pushed += 1
+        if None not in came_from:
+            return []
+
+        # refine the chain of nodes into tiles, only the clusters it passes through
+        chain = [None]
+        while chain[-1] != start:
+            chain.append(came_from[chain[-1]])
+        chain.reverse()
+        path = [start]
+        for node, next_node in zip(chain, chain[1:]):
+            if next_node is None:
+                path += self.walk(self.node_search(node, searches)[1], end)[1:]
+            elif self.cluster(node) == self.cluster(next_node):
+                path += self.walk(self.node_search(node, searches)[1], next_node)[1:]
+            else:
+                path.append(next_node)
+        return path
+
+    def node_search(self, node, searches):
+        """The search inside its cluster from an entrance, or from another node of a path being planned"""
+        entrances = self.entrances(self.cluster(node))
+        if node in entrances:
+            return entrances[node]
+        if node not in searches:
+            searches[node] = self.search(node, self.cluster(node))
+        return searches[node]
+
+    def walk(self, parents, tile):
+        """Tiles from the origin of a search to one of the tiles it reached"""
+        tiles = []
+        while tile is not None:
+            tiles.append(tile)
+            tile = parents[tile]
+        tiles.reverse()
+        return tiles
+
+    def estimate(self, tile, end):
+        return abs(tile[0] - end[0]) + abs(tile[1] - end[1])
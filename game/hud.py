@@ -1,5 +1,7 @@
 import pygame as pg
+from .assets import assets
 from .utils import draw_text
+from .text import text_renderer
 from .buildings import Buildings
 from .settings import ELECTRICITY_MULTIPLIER, MOISTURE_MULTIPLIER, WATER_PUMP_COST_MULTIPLIER, SOLAR_PANEL_CLEANING_COST_MULTIPLIER, TEXT_SIZE
 
@@ -15,6 +17,8 @@ class Hud:
         #resources hud
         self.resources_surface = pg.Surface((width, height*0.02), pg.SRCALPHA)
         self.game_time = 0  # Track the game time (0-23 hours)
+        self.time_of_day = 0  # game time including the fraction of the current hour
+        self.sim_speed = 1  # simulation speed multiplier, 0 when paused
         self.resources_rect = self.resources_surface.get_rect(topleft=(0,0))
         self.resources_surface.fill(self.hud_color)
 
@@ -34,7 +38,7 @@ class Hud:
 
         #select hud
         self.select_surface = pg.Surface((width * 0.3, height* 0.25), pg.SRCALPHA)
-        self.select_rect = self.select_surface.get_rect(topleft=(self.width * 0.35, self.height*0.8))
+        self.select_rect = self.select_surface.get_rect(topleft=(self.width * 0.35, self.height * 0.74))
         self.select_surface.fill(self.hud_color)
 
         # Caching variables for select hud
@@ -62,6 +66,17 @@ class Hud:
         # Create a transparent surface for the red frame
         self.frame_surface = pg.Surface((width, height), pg.SRCALPHA)
 
+        # panels whose contents can change every frame, each is redrawn only when what it shows changed
+        self.stats_rect = pg.Rect(0, 0, width * 0.2, 55 + TEXT_SIZE)  # fps and cache counters
+        self.counters_rect = pg.Rect(width - 960, 0, 960, TEXT_SIZE + 10)  # resources and clock
+        self.build_panel_rect = self.build_rect.union(self.build_surface.get_rect(topleft=(self.building_hud_x, self.building_hud_y)))
+        self.last_layout = None
+        self.stats = []  # cache counters of this frame, the text cache counts the draws so they are taken once before drawing
+        self.last_stats = None
+        self.last_counters = None
+        self.last_affordable = None
+        self.last_select_attrs = None
+
     def update(self):
         mouse_pos = pg.mouse.get_pos()
         mouse_action = pg.mouse.get_pressed()
@@ -76,19 +91,9 @@ class Hud:
 
             # Store current attribute values for cache comparison
             if self.examined_tile is not None:
-                self.prev_examined_tile_attr = {
-                    'name': getattr(self.examined_tile, 'name', None),
-                    'electricity_consumption': getattr(self.examined_tile, 'electricity_consumption', None),
-                    'water_consumption': getattr(self.examined_tile, 'water_consumption', None),
-                    'thugoleon_consumption': getattr(self.examined_tile, 'thugoleon_consumption', None),
-                    'electricity_production_rate': getattr(self.examined_tile, 'electricity_production_rate', None),
-                    'water_production_rate': getattr(self.examined_tile, 'water_production_rate', None),
-                    'thugoleon_production_rate': getattr(self.examined_tile, 'thugoleon_production_rate', None),
-                    'worker_count': getattr(self.examined_tile, 'worker_count', None),
-                    'worker_count_current': getattr(self.examined_tile, 'worker_count_current', None),
-                    'electricity': getattr(self.examined_tile, 'electricity', None),
-                    'water': getattr(self.examined_tile, 'water', None)
-                }
+                self.prev_examined_tile_attr = self.examined_tile_attrs()
+
+        self.stats = self.stats_texts()
 
         for tile in self.tiles:
             if self.resource_manager.is_affordable(tile["name"]):
@@ -99,6 +104,69 @@ class Hud:
                 if mouse_action[0]:
                     self.selected_tile = tile
 
+    def examined_tile_attrs(self):
+        """Values of the examined tile shown in the select hud"""
+        return {
+            'name': getattr(self.examined_tile, 'name', None),
+            'electricity_consumption': getattr(self.examined_tile, 'electricity_consumption', None),
+            'water_consumption': getattr(self.examined_tile, 'water_consumption', None),
+            'thugoleon_consumption': getattr(self.examined_tile, 'thugoleon_consumption', None),
+            'electricity_production_rate': getattr(self.examined_tile, 'electricity_production_rate', None),
+            'water_production_rate': getattr(self.examined_tile, 'water_production_rate', None),
+            'thugoleon_production_rate': getattr(self.examined_tile, 'thugoleon_production_rate', None),
+            'worker_count': getattr(self.examined_tile, 'worker_count', None),
+            'worker_count_current': getattr(self.examined_tile, 'worker_count_current', None),
+            'electricity': getattr(self.examined_tile, 'electricity', None),
+            'water': getattr(self.examined_tile, 'water', None)
+        }
+
+    def stats_texts(self):
+        """Cache counters drawn under the fps counter"""
+        texts = []
+        cache_total = self.cache_hits + self.cache_misses
+        if cache_total > 0:
+            efficiency = (self.cache_hits / cache_total) * 100
+            texts.append(f"Cache: {efficiency:.1f}% ({self.cache_hits}/{cache_total})")
+        texts.append(f"Text cache: {text_renderer.hit_rate():.1f}%")
+        return texts
+
+    def counter_texts(self):
+        """Resource counters followed by the clock, as drawn in the top right"""
+        texts = [resource + ": " + str(max(0,resource_value)) for resource, resource_value in self.resource_manager.resources.items()]
+        time_str = f"Time: {str(self.game_time).zfill(2)}:00 " + (f"x{self.sim_speed}" if self.sim_speed else "paused")
+        texts.append(time_str)
+        return texts
+
+    def changed_rects(self, fps_text):
+        """Returns the hud areas whose contents changed since the last frame, or None when the hud layout changed"""
+        layout = (self.delete_mode, self.selected_tile["name"] if self.selected_tile is not None else None, self.examined_tile)
+        layout_changed = layout != self.last_layout
+        self.last_layout = layout
+
+        # what each panel shows, compared to the last frame
+        stats = [fps_text] + self.stats
+        counters = self.counter_texts()
+        affordable = [tile["affordable"] for tile in self.tiles]
+        select_attrs = self.examined_tile_attrs() if self.examined_tile is not None else None
+        rects = []
+        if stats != self.last_stats:
+            rects.append(self.stats_rect)
+        if counters != self.last_counters:
+            rects.append(self.counters_rect)
+        if affordable != self.last_affordable:
+            rects.append(self.build_panel_rect)
+        if select_attrs != self.last_select_attrs:
+            rects.append(self.select_rect)
+        self.last_stats = stats
+        self.last_counters = counters
+        self.last_affordable = affordable
+        self.last_select_attrs = select_attrs
+
+        # tooltips follow the mouse while placing
+        if layout_changed or (hasattr(self, 'world') and self.world.temp_tile is not None):
+            return None
+        return rects
+
     def create_build_hud(self):
         render_pos = [self.building_hud_x+20, self.building_hud_y+50] # Start position for rendering building icons
         object_width = self.build_surface.get_width() // 6
@@ -128,10 +196,8 @@ class Hud:
         screen.blit(self.resources_surface, (0, 0))
 
         # Display cache efficiency stats
-        cache_total = self.cache_hits + self.cache_misses
-        if cache_total > 0:
-            efficiency = (self.cache_hits / cache_total) * 100
-            draw_text(screen, f"Cache: {efficiency:.1f}% ({self.cache_hits}/{cache_total})", TEXT_SIZE * 0.75 , (0, 255, 0), (15, 35))
+        for i, text in enumerate(self.stats):
+            draw_text(screen, text, TEXT_SIZE * 0.75 , (0, 255, 0), (15, 55 - 20 * (len(self.stats) - 1 - i)))
 
         # build hud
         screen.blit(self.build_surface, (self.building_hud_x, self.building_hud_y))
@@ -147,20 +213,12 @@ class Hud:
         if self.examined_tile is not None:
             self.draw_select_hud(screen)
 
-        # resources
+        # resources, then the in-game clock at the end of them
         pos = self.width - 950
-        for resource, resource_value in self.resource_manager.resources.items():
-            txt = resource + ": " + str(max(0,resource_value))
+        for txt in self.counter_texts():
             draw_text(screen, txt, TEXT_SIZE, (255, 255, 255), (pos, 5))
             pos += len(txt) * 13
 
-        # Draw in-game clock at the end of resources
-        if hasattr(self, 'game_time'):
-            hours_str = str(self.game_time).zfill(2)
-            minutes_str = "00"
-            time_str = f"Time: {hours_str}:{minutes_str}"
-            draw_text(screen, time_str, TEXT_SIZE, (255, 255, 255), (pos, 5))
-
         # Draw building information tooltip if temp_tile exists
         if hasattr(self, 'world') and self.world.temp_tile is not None:
             self.draw_building_info(screen)
@@ -196,26 +254,14 @@ class Hud:
         if self.select_cache_valid and self.examined_tile == self.last_examined_tile:
             # Do attribute comparison to ensure nothing changed
             if self.examined_tile is not None:
-                current_attrs = {
-                    'name': getattr(self.examined_tile, 'name', None),
-                    'electricity_consumption': getattr(self.examined_tile, 'electricity_consumption', None),
-                    'water_consumption': getattr(self.examined_tile, 'water_consumption', None),
-                    'thugoleon_consumption': getattr(self.examined_tile, 'thugoleon_consumption', None),
-                    'electricity_production_rate': getattr(self.examined_tile, 'electricity_production_rate', None),
-                    'water_production_rate': getattr(self.examined_tile, 'water_production_rate', None),
-                    'thugoleon_production_rate': getattr(self.examined_tile, 'thugoleon_production_rate', None),
-                    'worker_count': getattr(self.examined_tile, 'worker_count', None),
-                    'worker_count_current': getattr(self.examined_tile, 'worker_count_current', None),
-                    'electricity': getattr(self.examined_tile, 'electricity', None),
-                    'water': getattr(self.examined_tile, 'water', None)
-                }
+                current_attrs = self.examined_tile_attrs()
                 if current_attrs != self.prev_examined_tile_attr:
                     self.select_cache_valid = False
                     self.prev_examined_tile_attr = current_attrs
 
             if self.select_cache_valid:
                 self.cache_hits += 1
-                screen.blit(self.cached_select_surface, (self.width * 0.35, self.height * 0.74))
+                screen.blit(self.cached_select_surface, self.select_rect.topleft)
                 return
 
         # If cache is invalid, render to cached surface
@@ -304,29 +350,21 @@ class Hud:
             desc_y = 40
             desc_x = 10
 
-            # Simple word wrapping
-            words = description.split(' ')
-            line = ''
+            # Word wrapping, the layout is cached per description
+            lines = text_renderer.wrap(description, TEXT_SIZE, max_width)
             y_offset = 0
 
-            for word in words:
-                test_line = line + word + ' '
-                test_width = pg.font.SysFont(None, int(TEXT_SIZE)).size(test_line)[0]
-
-                if test_width > max_width:
-                    draw_text(self.cached_select_surface, line, description_text_size, (255, 255, 255), (desc_x, desc_y + y_offset))
-                    y_offset += TEXT_SIZE
-                    line = word + ' '
-                else:
-                    line = test_line
+            for line in lines[:-1]:
+                draw_text(self.cached_select_surface, line, description_text_size, (255, 255, 255), (desc_x, desc_y + y_offset))
+                y_offset += TEXT_SIZE
 
             # Render the last line
-            if line:
-                draw_text(self.cached_select_surface, line, TEXT_SIZE, (255, 255, 255), (desc_x, desc_y + y_offset))
+            if lines:
+                draw_text(self.cached_select_surface, lines[-1], TEXT_SIZE, (255, 255, 255), (desc_x, desc_y + y_offset))
 
         # Mark cache as valid and display it
         self.select_cache_valid = True
-        screen.blit(self.cached_select_surface, (self.width * 0.35, self.height * 0.74))
+        screen.blit(self.cached_select_surface, self.select_rect.topleft)
 
     def draw_building_info(self, screen):
         # Get mouse position
@@ -353,8 +391,7 @@ class Hud:
         cost_text = f"Cost: {cost_info['thugoleons']} thugoleons"
 
         # Render text
-        font = pg.font.SysFont(None, int(TEXT_SIZE*0.8))
-        cost_surface = font.render(cost_text, True, (255, 255, 255))
+        cost_surface = text_renderer.render(cost_text, TEXT_SIZE*0.8, (255, 255, 255))
         cost_rect = cost_surface.get_rect()
         cost_rect.topleft = (mouse_pos[0] + 20, mouse_pos[1] + 20)
 
@@ -368,7 +405,7 @@ class Hud:
 
         # Draw description if available
         if description_text:
-            description_surface = font.render(description_text, True, (255, 255, 255))
+            description_surface = text_renderer.render(description_text, TEXT_SIZE*0.8, (255, 255, 255))
             description_rect = description_surface.get_rect()
             description_rect.topleft = (mouse_pos[0] + 20, mouse_pos[1] + 50)
 
@@ -382,7 +419,7 @@ class Hud:
         self.preview_surface.fill(self.hud_color)
 
         # Get grid position and calculate potential production
-        grid_pos = self.world.mouse_to_grid(pg.mouse.get_pos()[0], pg.mouse.get_pos()[1], self.world.camera.scroll)
+        grid_pos = self.world.hovered_tile
         building_name = self.selected_tile["name"]
 
         # Only display for production buildings
@@ -395,13 +432,13 @@ class Hud:
                      (255, 255, 255), (self.preview_rect.x + 10, self.preview_rect.y + 10))
 
             # Calculate potential resource values
-            font = pg.font.SysFont(None, 26)
+            font_size = 26
             y_offset = 45
             y_margin = 25
 
             # Draw building costs
             cost_text = f"Cost: {self.resource_manager.costs[building_name]['thugoleons']} thugoleons"
-            cost_surface = font.render(cost_text, True, (255, 200, 100))
+            cost_surface = text_renderer.render(cost_text, font_size, (255, 200, 100))
             screen.blit(cost_surface, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
             y_offset += 30
 
@@ -415,15 +452,15 @@ class Hud:
                 cons_text1 = f"Consumes: +{electricity_consumption} electricity/s"
                 cons_text2 = f"Consumes: +{water_consumption} water/s"
 
-                prod_surface = font.render(prod_text, True, (100, 255, 100))
+                prod_surface = text_renderer.render(prod_text, font_size, (100, 255, 100))
                 screen.blit(prod_surface, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface1 = font.render(cons_text1, True, (255, 100, 100))
+                cons_surface1 = text_renderer.render(cons_text1, font_size, (255, 100, 100))
                 screen.blit(cons_surface1, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface2 = font.render(cons_text2, True, (255, 100, 100))
+                cons_surface2 = text_renderer.render(cons_text2, font_size, (255, 100, 100))
                 screen.blit(cons_surface2, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
 
             elif building_name == "residential_building":
@@ -435,15 +472,15 @@ class Hud:
                 cons_text1 = f"Consumes: +{electricity_consumption} electricity/s"
                 cons_text2 = f"Consumes: +{water_consumption} water/s"
 
-                prod_surface = font.render(prod_text, True, (100, 255, 100))
+                prod_surface = text_renderer.render(prod_text, font_size, (100, 255, 100))
                 screen.blit(prod_surface, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface1 = font.render(cons_text1, True, (255, 100, 100))
+                cons_surface1 = text_renderer.render(cons_text1, font_size, (255, 100, 100))
                 screen.blit(cons_surface1, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface2 = font.render(cons_text2, True, (255, 100, 100))
+                cons_surface2 = text_renderer.render(cons_text2, font_size, (255, 100, 100))
                 screen.blit(cons_surface2, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
 
             elif building_name == "solar_panels":
@@ -457,15 +494,15 @@ class Hud:
                 cons_text1 = f"Consumes: +{potential_water_consumption} water/s"
                 cons_text2 = f"Consumes: +{thugoleon_consumption} thugoleon/s"
 
-                prod_surface = font.render(prod_text, True, (100, 255, 100))
+                prod_surface = text_renderer.render(prod_text, font_size, (100, 255, 100))
                 screen.blit(prod_surface, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface1 = font.render(cons_text1, True, (255, 100, 100))
+                cons_surface1 = text_renderer.render(cons_text1, font_size, (255, 100, 100))
                 screen.blit(cons_surface1, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface2 = font.render(cons_text2, True, (255, 100, 100))
+                cons_surface2 = text_renderer.render(cons_text2, font_size, (255, 100, 100))
                 screen.blit(cons_surface2, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
 
             elif building_name == "water_treatment_plant":
@@ -478,24 +515,24 @@ class Hud:
                 cons_text1 = f"Consumes: +{potential_electricity_consumption} electricity/s"
                 cons_text2 = f"Consumes: +{thugoleon_consumption} thugoleon/s"
 
-                prod_surface = font.render(prod_text, True, (100, 255, 100))
+                prod_surface = text_renderer.render(prod_text, font_size, (100, 255, 100))
                 screen.blit(prod_surface, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface1 = font.render(cons_text1, True, (255, 100, 100))
+                cons_surface1 = text_renderer.render(cons_text1, font_size, (255, 100, 100))
                 screen.blit(cons_surface1, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
                 y_offset += y_margin
 
-                cons_surface2 = font.render(cons_text2, True, (255, 100, 100))
+                cons_surface2 = text_renderer.render(cons_text2, font_size, (255, 100, 100))
                 screen.blit(cons_surface2, (self.preview_rect.x + 10, self.preview_rect.y + y_offset))
 
     def load_images(self):
         """Loads all hud textures"""
-        residential_building = pg.image.load("assets/graphics/residential_building.png").convert_alpha()
-        factory = pg.image.load("assets/graphics/factory.png").convert_alpha()
-        solar_panels = pg.image.load("assets/graphics/solar_panels.png").convert_alpha()
-        water_treatment_plant = pg.image.load("assets/graphics/water_treatment_plant.png").convert_alpha()
-        road = pg.image.load("assets/graphics/road_tiles/road_1.png").convert_alpha()
+        residential_building = assets.image("assets/graphics/residential_building.png")
+        factory = assets.image("assets/graphics/factory.png")
+        solar_panels = assets.image("assets/graphics/solar_panels.png")
+        water_treatment_plant = assets.image("assets/graphics/water_treatment_plant.png")
+        road = assets.image("assets/graphics/road_tiles/road_1.png")
 
         return {
             "residential_building": residential_building,
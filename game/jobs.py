@@ -0,0 +1,104 @@
+from collections import deque
+from .settings import JOB_OCCUPANCY_COST, FIELD_CACHE_SIZE
+
+WORK_SHIFT_START = 7 # hour the citizens leave for work, see Citizen.schedule
+
+class JobMarket:
+    def __init__(self, world):
+        """Assigns citizens to factories with open slots, replaces each citizen scanning the grid for a workplace"""
+        self.world = world
+        self.factories = {}  # factory -> its assigned workers, in placement order
+        self.open = {}  # factories with open slots -> number of assigned workers
+        self.citizens = []
+        self.waiting = deque()  # unemployed citizens queued at the start of the work shift
+        self.last_hour = None
+
+    def add_factory(self, factory):
+        self.factories[factory] = []
+        self.open[factory] = 0
+
+    def remove_factory(self, factory):
+        """Forgets a demolished factory and finds new jobs for its workers"""
+        workers = self.factories.pop(factory, [])
+        self.open.pop(factory, None)
+        for citizen in workers:
+            citizen.workplace = None
+            citizen.workplace_grid_pos = None
+            citizen.contributed_to_worker_count = False
+        self.assign(workers)
+
+    def add_citizen(self, citizen):
+        self.citizens.append(citizen)
+
+    def update(self):
+        """Queues the unemployed citizens when the work shift starts and hires them under the scheduler's work budget"""
+        hour = self.world.clock.hour
+        if hour != self.last_hour:
+            self.last_hour = hour
+            if hour == WORK_SHIFT_START:
+                self.waiting = deque(citizen for citizen in self.citizens if citizen.workplace is None)
+        # each hire searches the roads, only as many run per frame as the schedule changes left room for
+        while self.waiting and self.open and self.world.scheduler.take_work():
+            citizen = self.waiting.popleft()
+            if citizen.workplace is None: # may have found a job on its own since
+                self.assign([citizen])
+
+    def assign(self, citizens):
+        """Gives each citizen the best reachable factory with an open slot, fewer workers and a shorter trip rank higher"""
+        for citizen in citizens:
+            if not self.open:
+                return
+            network = self.world.road_network
+            # the distance field of each factory is shared by every citizen looking for a job,
+            # with more factories than cached fields one search from the citizen is cheaper
+            distances = network.distances_from(citizen.tile["grid"]) if len(self.open) > FIELD_CACHE_SIZE else None
+            best, best_score = None, None
+            for factory, worker_count in self.open.items():
+                # only factories on the citizen's part of the road network are worth measuring
+                if factory.adjacent_road is None or not network.reachable(citizen.tile["grid"], factory.adjacent_road):
+                    continue
+                if distances is not None:
+                    distance = distances[factory.adjacent_road]
+                else:
+                    distance = network.distance(citizen.tile["grid"], factory.adjacent_road)
+                score = distance + JOB_OCCUPANCY_COST * worker_count
+                if best is None or score < best_score:
+                    best, best_score = factory, score
+            if best is not None:
+                self.hire(citizen, best)
+
+    def hire(self, citizen, factory):
+        workers = self.factories[factory]
+        workers.append(citizen)
+        factory.worker_count = len(workers)
+        if factory.worker_count < factory.worker_max_capacity:
+            self.open[factory] = factory.worker_count
+        else:
+            del self.open[factory]
+        citizen.workplace = factory
+        citizen.workplace_grid_pos = factory.adjacent_road
+
+    def fire(self, citizen):
+        """Takes the citizen off its factory's workers and reopens the slot"""
+        factory = citizen.workplace
+        workers = self.factories.get(factory)
+        if workers is not None and citizen in workers:
+            workers.remove(citizen)
+            factory.worker_count = len(workers)
+            self.open[factory] = factory.worker_count
+        if citizen.contributed_to_worker_count:
+            factory.worker_count_current -= 1
+        citizen.workplace = None
+        citizen.workplace_grid_pos = None
+        citizen.contributed_to_worker_count = False
+
+    def find_job(self, citizen):
+        """Keeps the citizen's job while the factory can be reached, or looks for another one"""
+        factory = citizen.workplace
+        if factory is not None:
+            # the registry may have moved the factory to another road since it was hired
+            citizen.workplace_grid_pos = factory.adjacent_road
+            if factory.adjacent_road is None or not self.world.road_network.reachable(citizen.tile["grid"], factory.adjacent_road):
+                self.fire(citizen)
+        if citizen.workplace is None:
+            self.assign([citizen])
@@ -0,0 +1,145 @@
+import heapq
+from .astar import Tile
+
+class JunctionGraph:
+    def __init__(self, network):
+        """The road network with its corridors collapsed, nodes are intersections and dead ends and edges are corridors with lengths"""
+        self.network = network
+        self.edges = {}  # node -> {next node: tiles of the corridor after the node, the next node last}
+
+    def is_node(self, tile):
+        return tile in self.network.labels and sum(1 for neighbor in self.network.neighbors(tile)) != 2
+
+    def walk(self, prev, tile, stops=()):
+        """Follows a corridor from prev through tile to the next node or stop, returns (end, tiles up to the end)"""
+        origin = prev
+        tiles = [tile]
+        while not self.is_node(tile) and tile not in stops:
+            prev, tile = tile, next(neighbor for neighbor in self.network.neighbors(tile) if neighbor != prev)
+            tiles.append(tile)
+            if tile == origin:
+                return None, tiles  # a loop without nodes
+        return tile, tuple(tiles)
+
+    def corridors(self, node, stops=()):
+        """(end, tiles up to the end) of every corridor leaving a tile"""
+        for first in self.network.neighbors(node):
+            end, tiles = self.walk(node, first, stops)
+            if end is not None and end != node:
+                yield end, tiles
+
+    def ends(self, grid_pos):
+        """Nodes the corridors next to a tile lead to, a corridor that ran through the tile had its ends among them"""
+        x, y = grid_pos
+        nodes = set()
+        for tile in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if tile in self.network.labels:
+                nodes.add(tile)
+                nodes.update(end for end, tiles in self.corridors(tile))
+        return nodes
+
+    def changed(self, grid_pos):
+        """Reconnects the nodes whose corridors ran through or next to an edited road"""
+        grid_pos = tuple(grid_pos)
+        x, y = grid_pos
+        affected = set()
+        for tile in (grid_pos, (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            # a tile that stopped being a node takes its edges with it
+            if tile in self.edges and not self.is_node(tile):
+                affected.update(self.edges.pop(tile))
+            if tile not in self.network.labels:
+                continue
+            if self.is_node(tile):
+                affected.add(tile)
+            for end, tiles in self.corridors(tile):
+                affected.add(end)
+        for node in affected:
+            if not self.is_node(node):
+                continue
+            edges = {}
+            for end, tiles in self.corridors(node):
+                if end not in edges or len(tiles) < len(edges[end]):
+                    edges[end] = tiles
+            self.edges[node] = edges
+
+    def find_path(self, start, end):
+        """The route from start to end as a Route, or an empty list, start may be off the roads"""
+        # the start and the end join the graph for this search only, next to or in the middle of a corridor
+        starts = [start] if start in self.network.labels else list(self.network.neighbors(start))
+        extra = {}  # node -> [(next node, tiles of the corridor)] of this search only
+        if start not in self.network.labels:
+            extra[start] = [(tile, (tile,)) for tile in starts]
+        for tile in starts:
+            if not self.is_node(tile):
+                extra.setdefault(tile, []).extend(self.corridors(tile, (end,)))
+        if not self.is_node(end):
+            for to, tiles in self.corridors(end, starts):
+                # the same corridor walked the other way, from the tile after the node to the end
+                extra.setdefault(to, []).append((end, tiles[-2::-1] + (end,)))
+
+        costs = {start: 0}
+        came_from = {start: None}
+        queue = [(self.estimate(start, end), 0, 0, start)]  # (estimate, push order, cost, node)
+        pushed = 1
+        while queue:
+            estimate, order, cost, node = heapq.heappop(queue)
+            if node == end:
+                break
+            if cost > costs[node]:
+                continue
+            hops = list(self.edges.get(node, {}).items()) + extra.get(node, [])
+            for to, tiles in hops:
+                new_cost = cost + len(tiles)
+                if to not in costs or new_cost < costs[to]:
+                    costs[to] = new_cost
+                    came_from[to] = (node, tiles)
+                    heapq.heappush(queue, (new_cost + self.estimate(to, end), pushed, new_cost, to))
+                    pushed += 1
+        if end not in came_from:
+            return []
+
+        hops = []
+        node = end
+        while came_from[node] is not None:
+            prev, tiles = came_from[node]
+            hops.append((prev, tiles))
+            node = prev
+        return Route(start, end, hops, costs[end] + 1)
+
+    def estimate(self, tile, end):
+        return abs(tile[0] - end[0]) + abs(tile[1] - end[1])
+
+class Route:
+    def __init__(self, start, end, hops, length):
+        """A path from junction to junction, its corridors are made into Tiles only when they are walked
+
+        The corridors keep the tiles they had when the route was planned, like any other path a removed
+        road stays on the route as a step without a road and the entity walking it plans again."""
+        self.start = start
+        self.end = end
+        self.hops = hops  # (node, tiles of the corridor after it) of each corridor not expanded yet, the last one first
+        self.length = length
+        self.nodes = [Tile(*start)]
+
+    def copy(self):
+        """The same route expanded separately, for another entity to walk"""
+        route = Route(self.start, self.end, list(self.hops), self.length)
+        route.nodes = list(self.nodes)
+        return route
+
+    def crosses(self, tile, index):
+        """Whether a tile is on the route from step index on, without expanding it"""
+        if tile in self.nodes[index:]:
+            return True
+        return any(tile == node or tile in corridor for node, corridor in self.hops)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index == self.length - 1 or index == -1:
+            return Tile(*self.end)  # the end is known without expanding
+        while len(self.nodes) <= index and self.hops:
+            prev, tiles = self.hops.pop()
+            self.nodes += [Tile(*tile) for tile in tiles]
+        return self.nodes[index]
@@ -0,0 +1,113 @@
+import heapq
+from .settings import LOGISTICS_BATCH, LOGISTICS_HORIZON
+
+RESOURCES = ["electricity", "water"]
+
+class Logistics:
+    def __init__(self, world):
+        """Sends resource agents to the buildings that lack the most, counting deliveries already on the way"""
+        self.world = world
+        self.demand = {resource: [] for resource in RESOURCES}  # heaps of (-deficit, order, building)
+        self.consumers = {resource: {} for resource in RESOURCES}  # building -> order it was placed in
+        self.reserved = {resource: {} for resource in RESOURCES}  # building -> amount on the way
+        self.reservations = {}  # agent -> (building, amount)
+        self.pending = {}  # agents waiting for a destination, in request order
+        self.placed = 0
+        self.last_batch = world.clock.get_ticks()
+        self.last_economy_tick = None
+
+    def add(self, building):
+        """Registers a placed building for every resource it consumes"""
+        self.placed += 1
+        for resource in RESOURCES:
+            if getattr(building, f"{resource}_consumption", 0) > 0:
+                self.consumers[resource][building] = self.placed
+                heapq.heappush(self.demand[resource], (-self.deficit(building, resource), self.placed, building))
+
+    def remove(self, building):
+        """Forgets a demolished building, agents on their way there get a new destination"""
+        for resource in RESOURCES:
+            self.consumers[resource].pop(building, None)  # its heap entry is dropped when it comes up
+            self.reserved[resource].pop(building, None)
+        for agent, (destination, amount) in list(self.reservations.items()):
+            if destination is building:
+                del self.reservations[agent]
+                agent.find_destination()
+
+    def deficit(self, building, resource):
+        """What the building lacks to run for LOGISTICS_HORIZON economy ticks, after the deliveries on the way"""
+        stock = getattr(building, resource) + self.reserved[resource].get(building, 0)
+        return getattr(building, f"{resource}_consumption") * LOGISTICS_HORIZON - stock
+
+    def rebuild(self):
+        """Re-ranks every consumer, their stocks all changed in the last economy tick"""
+        for resource, consumers in self.consumers.items():
+            self.demand[resource] = [(-self.deficit(building, resource), order, building) for building, order in consumers.items()]
+            heapq.heapify(self.demand[resource])
+
+    def request(self, agent):
+        """Queues an agent for the next batch"""
+        self.pending[agent] = True
+
+    def update(self):
+        """Assigns the waiting agents once every LOGISTICS_BATCH, the ones without a destination wait for the next batch"""
+        now = self.world.clock.get_ticks()
+        if not self.pending or now - self.last_batch < LOGISTICS_BATCH:
+            return
+        self.last_batch = now
+        if self.last_economy_tick != self.world.economy.last_tick:
+            self.last_economy_tick = self.world.economy.last_tick
+            self.rebuild()
+        for agent in list(self.pending):
+            if self.assign(agent):
+                del self.pending[agent]
+                self.world.scheduler.wake(agent)
+
+    def assign(self, agent):
+        """Gives an agent the reachable building with the largest deficit and reserves its delivery"""
+        resource = agent.resource_type
+        heap = self.demand[resource]
+        network = self.world.road_network
+        unreachable = []
+        found = None
+        while heap:
+            key, order, building = heapq.heappop(heap)
+            if building not in self.consumers[resource]:
+                continue
+            if -key <= 0:
+                # nobody lacks anything, keep the entry for the next batch
+                unreachable.append((key, order, building))
+                break
+            if building.adjacent_road is None or not network.reachable(agent.road_tile["grid"], building.adjacent_road):
+                unreachable.append((key, order, building))
+                continue
+            found = building
+            amount = min(agent.carried_amount, agent.single_dropoff_amount)
+            self.reserved[resource][building] = self.reserved[resource].get(building, 0) + amount
+            self.reservations[agent] = (building, amount)
+            heapq.heappush(heap, (-self.deficit(building, resource), order, building))
+            break
+        for entry in unreachable:
+            heapq.heappush(heap, entry)
+
+        if found is None:
+            return False
+        agent.destination = found
+        agent.destination_grid_pos = found.adjacent_road
+        agent.create_path(agent.destination_grid_pos)
+        return True
+
+    def delivered(self, agent):
+        """Turns the agent's reservation into stock, called right before the delivery"""
+        self.cancel(agent)
+
+    def cancel(self, agent):
+        """Drops the agent's reservation, its delivery is made or won't arrive"""
+        building, amount = self.reservations.pop(agent, (None, 0))
+        if building is None:
+            return
+        reserved = self.reserved[agent.resource_type]
+        if building in reserved:
+            reserved[building] -= amount
+            if reserved[building] <= 0:
+                del reserved[building]
@@ -1,6 +1,7 @@
 import pygame as pg
 
 from game.utils import draw_text
+from .text import text_renderer
 from .settings import TEXT_SIZE
 
 class Menu:
@@ -64,8 +65,7 @@ class Menu:
             pg.draw.rect(self.screen, button_color_current, self.button_rect)
 
             # Draw button text
-            button_font = pg.font.Font(None, 36)
-            button_text = button_font.render('Start Game', True, (255, 255, 255))
+            button_text = text_renderer.render('Start Game', 36, (255, 255, 255))
             text_rect = button_text.get_rect(center=self.button_rect.center)
             self.screen.blit(button_text, text_rect)
 
@@ -0,0 +1,79 @@
+import pygame as pg
+from .settings import TILE_SIZE
+
+class Overlay:
+    def __init__(self, world):
+        """Selection outlines and hover, delete and placement highlights drawn on top of the world"""
+        self.world = world
+
+        # one outline polygon per sprite, relative to the sprite's top left corner
+        self.outlines = {}
+
+        # translucent red tile for delete mode, the tile diamond relative to its render position
+        self.delete_highlight = pg.Surface((2 * TILE_SIZE + 1, TILE_SIZE + 1), pg.SRCALPHA)
+        pg.draw.polygon(self.delete_highlight, (255, 0, 0, 128),
+                        [(TILE_SIZE, 0), (2 * TILE_SIZE, TILE_SIZE / 2), (TILE_SIZE, TILE_SIZE), (0, TILE_SIZE / 2)])
+
+    def outline(self, image):
+        """Returns the outline polygon of a sprite, computing it once"""
+        if image not in self.outlines:
+            self.outlines[image] = pg.mask.from_surface(image).outline()
+        return self.outlines[image]
+
+    def rects(self, camera):
+        """Returns the screen areas covered by the examine outline and the delete highlight"""
+        offset_x = self.world.render_offset_x + camera.scroll.x
+        offset_y = camera.scroll.y
+        rects = []
+        if self.world.examine_tile is not None:
+            x, y = self.world.examine_tile
+            building = self.world.buildings[x][y]
+            if building is not None:
+                render_pos = self.world.world[x][y]["render_pos"]
+                building_y = render_pos[1] - (building.image.get_height() - 2 * TILE_SIZE) + offset_y
+                # the outline is 3 pixels wide
+                rects.append((int(render_pos[0] + offset_x) - 2, int(building_y) - 2,
+                              building.image.get_width() + 4, building.image.get_height() + 4))
+        hovered_tile = self.world.hovered_tile
+        if self.world.hud.delete_mode and hovered_tile is not None:
+            render_pos = self.world.world[hovered_tile[0]][hovered_tile[1]]["render_pos"]
+            rects.append((int(render_pos[0] + offset_x), int(render_pos[1] + offset_y + 0.5*TILE_SIZE)) + self.delete_highlight.get_size())
+        return rects
+
+    def draw(self, screen, camera):
+        """Draws every highlight in one pass after the world"""
+        offset_x = self.world.render_offset_x + camera.scroll.x
+        offset_y = camera.scroll.y
+
+        # outline of the examined building
+        if self.world.examine_tile is not None:
+            x, y = self.world.examine_tile
+            building = self.world.buildings[x][y]
+            if building is not None:
+                render_pos = self.world.world[x][y]["render_pos"]
+                building_x = render_pos[0] + offset_x
+                building_y = render_pos[1] - (building.image.get_height() - 2 * TILE_SIZE) + offset_y
+                outline = [(px + building_x, py + building_y) for px, py in self.outline(building.image)]
+                pg.draw.polygon(screen, (255, 255, 255), outline, 3)
+
+        # red tile under the mouse in delete mode
+        hovered_tile = self.world.hovered_tile
+        if self.world.hud.delete_mode and hovered_tile is not None:
+            render_pos = self.world.world[hovered_tile[0]][hovered_tile[1]]["render_pos"]
+            screen.blit(self.delete_highlight, (render_pos[0] + offset_x, render_pos[1] + offset_y + 0.5*TILE_SIZE))
+
+        # Draw the temporary tile's polygon
+        temp_tile = self.world.temp_tile
+        if temp_tile is not None:
+            iso_poly = [(x + offset_x, y - (temp_tile["image"].get_height() - 2.5*TILE_SIZE) + offset_y) for x, y in temp_tile["iso_poly"]]
+            if temp_tile["buildable"] or temp_tile["water_resource"] and self.world.hud.selected_tile["name"] == "water_treatment_plant":
+                # orange when it would be cut off from the main road network
+                color = (255, 255, 255) if temp_tile["connected"] else (255, 165, 0)
+                pg.draw.polygon(screen, color, iso_poly, 3)
+            elif temp_tile["user_built"]:
+                pg.draw.polygon(screen, (0, 0, 255), iso_poly, 3)
+            else:
+                pg.draw.polygon(screen, (255, 0, 0), iso_poly, 3)
+            render_pos = temp_tile["render_pos"]
+            screen.blit(temp_tile["image"],
+                        (render_pos[0] + offset_x, render_pos[1] - (temp_tile["image"].get_height() - 2 * TILE_SIZE) + offset_y))
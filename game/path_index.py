@@ -0,0 +1,79 @@
+from itertools import islice
+from .junctions import Route
+from .settings import REPLAN_BUDGET
+
+class PathIndex:
+    def __init__(self, world):
+        """Citizens and agents by the tiles their paths cross, a removed road re-plans only the paths that still had to cross it"""
+        self.world = world
+        self.tiles = {}  # tile -> entities whose path crosses it, or passes it as a junction for routes
+        self.paths = {}  # entity -> (path, {tile: step of the path} or None for a route, indexed tiles, destination)
+        self.pending = {}  # entity -> (destination, path to replace), re-plans waiting for a step with budget left, in removal order
+        self.stranded = {}  # entity -> destination it can't reach, planned again when a road is added
+
+    def track(self, entity):
+        """Indexes the new path of an entity, called whenever it gets one"""
+        self.untrack(entity)
+        self.stranded.pop(entity, None)
+        path = entity.path
+        if not path:
+            return
+        if isinstance(path, Route):
+            # a route is indexed by its junctions, its corridors stay unexpanded until they are walked
+            steps = None
+            tiles = {tuple(tile) for tile in path.nodes} | {node for node, corridor in path.hops} | {path.end}
+        else:
+            steps = {}
+            for step in range(len(path)):
+                steps[tuple(path[step])] = step
+            tiles = steps
+        for tile in tiles:
+            self.tiles.setdefault(tile, set()).add(entity)
+        self.paths[entity] = (path, steps, tiles, tuple(path[len(path) - 1]))
+
+    def untrack(self, entity):
+        path, steps, tiles, destination = self.paths.pop(entity, (None, None, (), None))
+        for tile in tiles:
+            entities = self.tiles.get(tile)
+            if entities is not None:
+                entities.discard(entity)
+                if not entities:
+                    del self.tiles[tile]
+
+    def strand(self, entity, destination):
+        """Forgets the path of an entity that can't reach its destination, it is planned again once a road is added"""
+        self.untrack(entity)
+        self.stranded[entity] = destination
+
+    def road_added(self, grid_pos):
+        """Queues a re-plan for every stranded entity, the new road may lead it to its destination"""
+        for entity, destination in self.stranded.items():
+            self.pending[entity] = (destination, entity.path)
+        self.stranded = {}
+
+    def road_removed(self, grid_pos):
+        """Queues a re-plan for every entity that hasn't walked past the removed road yet"""
+        grid_pos = tuple(grid_pos)
+        entities = self.tiles.pop(grid_pos, set())
+        # routes that ran through the road are indexed at the junctions its corridors lead to
+        for node in self.world.road_network.junctions.ends(grid_pos):
+            entities |= self.tiles.get(node, set())
+        for entity in entities:
+            path, steps, tiles, destination = self.paths[entity]
+            if entity.path is not path:
+                continue
+            if steps is None:
+                ahead = path.crosses(grid_pos, entity.path_index)
+            else:
+                ahead = grid_pos in steps and steps[grid_pos] >= entity.path_index
+            if ahead:
+                self.pending[entity] = (destination, path)
+
+    def update(self):
+        """Re-plans at most REPLAN_BUDGET of the queued paths, the rest wait for the next steps"""
+        for entity in list(islice(self.pending, REPLAN_BUDGET)):
+            destination, path = self.pending.pop(entity)
+            # an entity that planned a new path on its own since doesn't need one
+            if entity.path is path:
+                entity.replan(destination)
+                self.world.scheduler.wake(entity)
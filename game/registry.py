@@ -0,0 +1,43 @@
+import bisect
+
+class SpatialRegistry:
+    def __init__(self, world):
+        """Road tiles and the roads buildings are served by, kept up to date on placement and demolition instead of scanning the grid"""
+        self.world = world
+        self.positions = {}  # entity -> grid_pos
+        self.road_tiles = []  # sorted like a scan of the grid, for random destinations
+        self.served = {}  # road tile -> buildings using it as their adjacent road
+
+    def add(self, grid_pos, entity):
+        grid_pos = tuple(grid_pos)
+        self.positions[entity] = grid_pos
+        if entity.name == "road":
+            bisect.insort(self.road_tiles, grid_pos)
+            # buildings that had no road next to them get this one
+            for neighbor in self.neighbors(grid_pos):
+                building = self.world.buildings[neighbor[0]][neighbor[1]]
+                if building is not None and building.adjacent_road is None:
+                    building.adjacent_road = grid_pos
+                    self.served.setdefault(grid_pos, set()).add(building)
+        elif entity.adjacent_road is not None:
+            self.served.setdefault(entity.adjacent_road, set()).add(entity)
+
+    def remove(self, grid_pos, entity):
+        grid_pos = tuple(grid_pos)
+        del self.positions[entity]
+        if entity.name == "road":
+            self.road_tiles.pop(bisect.bisect_left(self.road_tiles, grid_pos))
+            # buildings that used this road look for another one next to them
+            for building in self.served.pop(grid_pos, ()):
+                building.adjacent_road = None
+                building.find_adjacent_road(self.world, self.positions[building])
+                if building.adjacent_road is not None:
+                    self.served.setdefault(building.adjacent_road, set()).add(building)
+        elif entity.adjacent_road in self.served:
+            self.served[entity.adjacent_road].discard(entity)
+
+    def neighbors(self, grid_pos):
+        x, y = grid_pos
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < self.world.grid_length_x and 0 <= ny < self.world.grid_length_y:
+                yield (nx, ny)
@@ -1,20 +1,18 @@
 import pygame as pg
 import random
-from pathfinding.core.diagonal_movement import DiagonalMovement
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
+from .assets import assets
 
 class ResourceAgent:
     def __init__(self, origin_name, origin_pos, road_tile, world, resource_type):
         """Initialize a resource agent object."""
         self.world = world
         self.world.entities.append(self) # add itself to entities for updating
+        self.world.scheduler.add(self)
         if resource_type == "electricity":
-            image = pg.image.load("assets/graphics/agent_electricity.png").convert_alpha()
+            self.image = assets.sprite("assets/graphics/agent_electricity.png", 2)
         elif resource_type == "water":
-            image = pg.image.load("assets/graphics/agent_water.png").convert_alpha()
+            self.image = assets.sprite("assets/graphics/agent_water.png", 2)
         self.name = f"agent_{random.randint(1, 1000)}"
-        self.image = pg.transform.scale(image, (image.get_width()*2, image.get_height()*2))
         self.road_tile = road_tile
 
         # resource carrying
@@ -33,9 +31,6 @@ class ResourceAgent:
         self.target_pos = pg.Vector2(road_tile["render_pos"][0], road_tile["render_pos"][1])
         self.is_moving = False
 
-        # Initialize a placeholder grid for the initial path creation
-        self.grid = Grid(matrix=self.world.collision_matrix)
-
         # initialize schedule variables
         self.origin_pos = origin_pos
         self.origin_grid_pos = road_tile["grid"]
@@ -45,100 +40,60 @@ class ResourceAgent:
         self.destination_grid_pos = None
 
         # movement timers
-        self.move_timer = pg.time.get_ticks()
+        self.move_timer = self.world.clock.get_ticks()
+        self.path = []
+        self.path_index = 0
+        self.stranded = False # no path to the destination, waits for a road to be added
+
+        self.find_destination()
 
     def pathfinder(self, x, y, origin):
-        ## Check if the destination is reachable for the agent
-        road_road_tiles = []
-        for i in range(self.world.grid_length_x):
-            for j in range(self.world.grid_length_y):
-                # Check if the tile has a road on it
-                if self.world.roads[i][j] is not None:
-                    road_road_tiles.append((i, j))
-
-        # Create temporary collision matrix
-        temp_collision_matrix = [row[:] for row in self.world.collision_matrix]
-
-        # Mark all non-road road_tiles as non-walkable
-        for i in range(self.world.grid_length_x):
-            for j in range(self.world.grid_length_y):
-                if self.world.roads[i][j] is None:
-                    temp_collision_matrix[j][i] = 0
-
-        # Exception for current agent's position
-        current_pos = self.road_tile["grid"]
-        temp_collision_matrix[current_pos[1]][current_pos[0]] = 1
-
-        self.grid = Grid(matrix=temp_collision_matrix) # collision matrix
-        self.start = self.grid.node(self.road_tile["grid"][0], self.road_tile["grid"][1])
-        self.end = self.grid.node(x, y) # destination
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.never)
-        path, runs = finder.find_path(self.start, self.end, self.grid)
-        return [path, runs]
+        # the road network keeps one road-only grid and reuses the paths found on it until the roads change
+        return self.world.road_network.find_path(self.road_tile["grid"], (x, y))
 
 
     def find_destination(self):
-        """Find a building to go to, prioritize ones with the lowest resource"""
-        destinations = []
-        # Look for all buildings in the world
-        for x in range(self.world.grid_length_x):
-            for y in range(self.world.grid_length_y):
-                building = self.world.buildings[x][y]
-                if building is not None and building.name != self.origin_name:
-                    if building.adjacent_road:
-                        # Store factory, its position, the adjacent road position, and current resources
-                        destinations.append((building, (x, y), building.adjacent_road, building.electricity, building.water))
-
-        if destinations:
-            # Sort buildings by resource
-            if self.resource_type == "electricity":
-                destinations.sort(key=lambda f: f[3])
-            elif self.resource_type == "water":
-                destinations.sort(key=lambda f: f[4])
-            # Choose the building with the lowest resource count
-            self.destination, destination_pos, self.destination_grid_pos, _, _ = destinations[0]
-
-            path, runs = self.pathfinder(self.destination_grid_pos[0], self.destination_grid_pos[1], self.road_tile["grid"])
-
-            if len(path) <= 0: # if path is invalid
-                # print(f"{self.name} has no valid path to destination {self.destination_grid_pos}")
-                self.destination, self.destination_grid_pos = None, None
-            else:
-                pass
-                # print(f"{self.name} valid path to destination of length {len(path)}")
-
-        else:
-            # If no destination exists, agent won't have a destination
-            print(f"{self.name} no destinations found")
-            self.destination = None
-            self.destination_grid_pos = None
+        """Ask the logistics dispatcher for a building to go to, it assigns the one that runs out first in its next batch"""
+        self.destination = None
+        self.destination_grid_pos = None
+        self.world.logistics.request(self)
 
     def create_path(self, destination):
         """Create a path to the destination road_tile or a random one if no destination is set"""
-        # find road road_tiles
-        road_road_tiles = []
-        for i in range(self.world.grid_length_x):
-            for j in range(self.world.grid_length_y):
-                # Check if road_tile has a road on it
-                if self.world.roads[i][j] is not None:
-                    road_road_tiles.append((i, j))
-        # If no road road_tiles are available, stay in place
-        if road_road_tiles is None:
-            self.change_road_tile(self.road_tile) # stay in place
-
         if destination is not None:
             x, y = destination # set the x and y coordinates to the destination
-        else:
+        elif self.world.registry.road_tiles:
             # Choose a random road road_tile as destination
-            x, y = random.choice(road_road_tiles)
+            x, y = random.choice(self.world.registry.road_tiles)
+        else:
+            return # If no road tiles are available, stay in place
 
-        path, runs = self.pathfinder(x, y, self.road_tile["grid"])
+        path = self.pathfinder(x, y, self.road_tile["grid"])
 
         if len(path) > 0: # if path is valid
             self.path_index = 0
             self.path = path
+            self.stranded = False
+            self.world.paths.track(self)
             return
 
+    def replan(self, destination):
+        """Plans a path to the destination, gives up on it if it can't be reached until the roads change"""
+        path = self.path
+        self.create_path(destination)
+        if self.path is not path:
+            return
+        self.path = []
+        self.path_index = 0
+        if self.replenishing:
+            # only the origin refills the agent, wait for a road back to it
+            self.stranded = True
+            self.world.paths.strand(self, destination)
+        else:
+            self.world.logistics.cancel(self)
+            self.world.paths.untrack(self)
+            self.find_destination()
+
     def change_road_tile(self, new_road_tile):
         current_grid_pos = self.road_tile["grid"]
         # Remove agent from current road_tile
@@ -156,10 +111,8 @@ class ResourceAgent:
             self.create_path(new_road_tile)  # If going to the next road_tile fails, find a path there
 
     def update(self):
-        if self.destination is None:
-            self.find_destination()
-            self.create_path(self.destination_grid_pos)
-        now = pg.time.get_ticks()
+        """Moves the agent and delivers its resource, returns the milliseconds until it needs the next update"""
+        now = self.world.clock.get_ticks()
 
         # Handle movement interpolation
         if self.is_moving:
@@ -182,9 +135,13 @@ class ResourceAgent:
                     self.change_road_tile(new_pos)
                     # print(f"Path of length {len(self.path)}, done {self.path_index}, carrying {self.carried_amount} {self.resource_type}")
                     self.path_index += 1
+                elif new_pos == self.road_tile["grid"]:
+                    # the path starts where the entity stands, on a road that has been removed since
+                    self.path_index += 1
                 else:
-                    # If destination has no road, find new path
-                    self.create_path(self.destination_grid_pos)
+                    # the road was removed before the path index re-planned this path
+                    end = self.path[len(self.path) - 1]
+                    self.replan((end.x, end.y))
                 self.move_timer = now
 
             # Reaching destination
@@ -207,12 +164,11 @@ class ResourceAgent:
                             self.origin.water -= resource_portion
                             # print(f"{self.name} replenished {resource_portion} water, now carrying {self.carried_amount}")
                         self.replenishing = False
-                        self.find_destination()  # find a new destination and create a path there
-                        if self.destination and self.destination_grid_pos:
-                            self.create_path(self.destination_grid_pos)
+                        self.find_destination()  # the dispatcher creates the path when it assigns a destination
                     else:
                         # give the destination building a part of the carried resource
                         resource_portion = min(self.carried_amount, self.single_dropoff_amount) # resource portion to give away to the destination building, cant be more than the amount carried
+                        self.world.logistics.delivered(self)
                         if self.resource_type == "electricity":
                             self.destination.electricity += resource_portion
                             self.carried_amount -= resource_portion
@@ -223,12 +179,16 @@ class ResourceAgent:
                         if self.carried_amount < self.single_dropoff_amount:
                             # create a path to the origin road_tile for resource replenishment
                             self.replenishing = True
-                            self.create_path(self.origin_grid_pos)
+                            self.replan(self.origin_grid_pos)
                         else:
-                            self.find_destination() # find a new destination and create a path there
-                            self.create_path(self.destination_grid_pos)
+                            self.find_destination() # find a new destination, the dispatcher creates the path there
                 else:
-                    print(f"{self.name} no destination exists")
                     self.find_destination()
-                    if self.destination and self.destination_grid_pos:
-                        self.create_path(self.destination_grid_pos)
+
+        # interpolate on every step while moving
+        if self.is_moving:
+            return 0
+        # wait for the dispatcher to wake the agent with a destination, or for a road that leads to it
+        if self.destination is None or self.stranded:
+            return None
+        return self.move_timer + 501 - now # next step along the path
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+from array import array
+from .hierarchy import ClusterGraph
+from .junctions import JunctionGraph, Route
+from .astar import FlatAStar, TilePath
+from .settings import PATH_CACHE_SIZE, FIELD_CACHE_SIZE, FIELD_MIN_REQUESTS
+
+class RoadNetwork:
+    def __init__(self, world):
+        """Connected parts of the road network, kept up to date on placement and demolition so reachability is a label lookup"""
+        self.world = world
+        self.labels = {}  # road tile -> label of the connected part it belongs to
+        self.members = {}  # label -> road tiles with that label
+        self.next_label = 0
+
+        # paths inside a cluster are searched tile by tile, longer ones over the junctions of the roads
+        # and paths across the city over the clusters of the map
+        self.astar = FlatAStar(world.grid_length_x, world.grid_length_y)
+        self.junctions = JunctionGraph(self)
+        self.clusters = ClusterGraph(self)
+
+        # found paths, valid while the part of the network they run on is unchanged
+        self.versions = {}  # label -> version of its part, changes with every edit of the part
+        self.version = 0
+        self.paths = OrderedDict()  # (start, end) -> (version, path), least recently used first
+        self.hits = 0
+        self.misses = 0
+
+        # distances to popular destinations, every path there follows them instead of searching
+        self.fields = OrderedDict()  # target -> (version, road tile -> steps to target), least recently used first
+        self.requests = {}  # target -> number of paths asked to it
+
+    def neighbors(self, grid_pos):
+        """Road tiles next to a tile, the moves the pathfinder allows"""
+        x, y = grid_pos
+        for neighbor in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if neighbor in self.labels:
+                yield neighbor
+
+    def new_label(self, tiles):
+        label = self.next_label
+        self.next_label += 1
+        self.members[label] = tiles
+        for tile in tiles:
+            self.labels[tile] = label
+        self.changed(label)
+        return label
+
+    def changed(self, label):
+        """Gives a part a new version, the cached paths on it become stale"""
+        self.version += 1
+        self.versions[label] = self.version
+
+    def add_road(self, grid_pos):
+        """Joins a new road to the parts next to it, the smaller parts take the label of the largest"""
+        grid_pos = tuple(grid_pos)
+        self.astar.set_road(grid_pos, True)
+        self.clusters.changed(grid_pos)
+        joined = {self.labels[neighbor] for neighbor in self.neighbors(grid_pos)}
+        if not joined:
+            self.new_label({grid_pos})
+        else:
+            largest = max(joined, key=lambda label: len(self.members[label]))
+            self.labels[grid_pos] = largest
+            self.members[largest].add(grid_pos)
+            for label in joined:
+                if label != largest:
+                    for tile in self.members[label]:
+                        self.labels[tile] = largest
+                    self.members[largest] |= self.members.pop(label)
+                    del self.versions[label]
+            self.changed(largest)
+        self.junctions.changed(grid_pos)
+
+    def remove_road(self, grid_pos):
+        """Removes a road and splits its part if the road was the only link between its neighbors"""
+        grid_pos = tuple(grid_pos)
+        self.astar.set_road(grid_pos, False)
+        self.clusters.changed(grid_pos)
+        label = self.labels.pop(grid_pos)
+        self.junctions.changed(grid_pos)
+        self.members[label].discard(grid_pos)
+        if not self.members[label]:
+            del self.members[label]
+            del self.versions[label]
+            return
+        self.changed(label)
+        neighbors = list(self.neighbors(grid_pos))
+        if len(neighbors) < 2:
+            return  # a dead end, the rest stays connected
+
+        # search from the first neighbor until it has found the others, only a split searches the whole part
+        reached = self.search(neighbors[0], set(neighbors[1:]))
+        if all(neighbor in reached for neighbor in neighbors[1:]):
+            return
+        parts = [reached]
+        for neighbor in neighbors[1:]:
+            if not any(neighbor in part for part in parts):
+                parts.append(self.search(neighbor, set()))
+        # the largest part keeps the old label
+        parts.sort(key=len, reverse=True)
+        self.members[label] = parts[0]
+        for part in parts[1:]:
+            self.new_label(part)
+
+    def search(self, start, targets):
+        """Road tiles connected to start, stops early once every target is found"""
+        stop_early = bool(targets)
+        reached = {start}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for tile in frontier:
+                for neighbor in self.neighbors(tile):
+                    if neighbor not in reached:
+                        reached.add(neighbor)
+                        next_frontier.append(neighbor)
+                        targets.discard(neighbor)
+            if stop_early and not targets:
+                return reached
+            frontier = next_frontier
+        return reached
+
+    def labels_at(self, grid_pos):
+        """Labels a tile connects to, its own for a road or the ones of the roads next to it"""
+        grid_pos = tuple(grid_pos)
+        if grid_pos in self.labels:
+            return {self.labels[grid_pos]}
+        return {self.labels[neighbor] for neighbor in self.neighbors(grid_pos)}
+
+    def reachable(self, start, end):
+        """Whether the pathfinder can find a path along the roads from start to end, start may be off the roads"""
+        start, end = tuple(start), tuple(end)
+        if start == end:
+            return True
+        if end not in self.labels:
+            return False
+        return self.labels[end] in self.labels_at(start)
+
+    def main_label(self):
+        """Label of the largest part of the network, or None without roads"""
+        if not self.members:
+            return None
+        return max(self.members, key=lambda label: len(self.members[label]))
+
+    def joins_main(self, grid_pos):
+        """Whether something built on a tile would be connected to the largest part of the network"""
+        main = self.main_label()
+        return main is None or main in self.labels_at(grid_pos)
+
+    def find_path(self, start, end):
+        """Tiles along the roads from start to end, or an empty list, start may be off the roads"""
+        start, end = tuple(start), tuple(end)
+        if start == end:
+            return self.tile_path([start])
+        if not self.reachable(start, end):
+            return []
+        version = self.versions.get(self.labels.get(end))
+        key = (start, end)
+        cached = self.paths.get(key)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            self.paths.move_to_end(key)
+            if isinstance(cached[1], Route):
+                return cached[1].copy()  # routes expand as they are walked, every entity gets its own
+            return cached[1]
+
+        self.misses += 1
+        self.requests[end] = self.requests.get(end, 0) + 1
+        clusters_apart = max(abs(a - b) for a, b in zip(self.clusters.cluster(start), self.clusters.cluster(end)))
+        if self.requests[end] >= FIELD_MIN_REQUESTS or end in self.fields:
+            path = self.follow(start, self.field(end))
+        elif clusters_apart == 0:
+            path = self.astar.find_path(start, end)
+        elif clusters_apart == 1:
+            path = self.junctions.find_path(start, end)
+        else:
+            # across the city, the clusters keep the search small whatever the map size
+            path = self.tile_path(self.clusters.find_path(start, end))
+
+        self.paths[key] = (version, path)
+        self.paths.move_to_end(key)
+        if len(self.paths) > PATH_CACHE_SIZE:
+            self.paths.popitem(last=False)
+        return path
+
+    def field(self, target):
+        """Steps from every road tile of the target's part to the target, computed once per version of the part"""
+        target = tuple(target)
+        version = self.versions.get(self.labels.get(target))
+        cached = self.fields.get(target)
+        if cached is not None and cached[0] == version:
+            self.fields.move_to_end(target)
+            return cached[1]
+
+        # one breadth first search from the target answers every start on its part
+        distances = self.distances_from(target)
+        self.fields[target] = (version, distances)
+        self.fields.move_to_end(target)
+        if len(self.fields) > FIELD_CACHE_SIZE:
+            # a dropped target has to become popular again before it gets a new field
+            dropped, field = self.fields.popitem(last=False)
+            self.requests.pop(dropped, None)
+        return distances
+
+    def distances_from(self, start):
+        """Steps along the roads from start to every road tile it reaches, start may be off the roads"""
+        start = tuple(start)
+        distances = {start: 0}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for tile in frontier:
+                for neighbor in self.neighbors(tile):
+                    if neighbor not in distances:
+                        distances[neighbor] = distances[tile] + 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distances
+
+    def distance(self, start, target):
+        """Steps along the roads from start to target, or None if it can't be reached, start may be off the roads"""
+        start, target = tuple(start), tuple(target)
+        if start == target:
+            return 0
+        if not self.reachable(start, target):
+            return None
+        distances = self.field(target)
+        if start in distances:
+            return distances[start]
+        return 1 + min(distances[neighbor] for neighbor in self.neighbors(start) if neighbor in distances)
+
+    def follow(self, start, distances):
+        """Tiles from start down the distance field to its target"""
+        tiles = [start]
+        tile = start
+        if tile not in distances:
+            # off the roads, step onto the closest road next to the start
+            tile = min((neighbor for neighbor in self.neighbors(start) if neighbor in distances), key=distances.get)
+            tiles.append(tile)
+        while distances[tile] > 0:
+            tile = next(neighbor for neighbor in self.neighbors(tile) if distances.get(neighbor) == distances[tile] - 1)
+            tiles.append(tile)
+        return self.tile_path(tiles)
+
+    def tile_path(self, tiles):
+        """A TilePath of (x, y) tiles, or an empty list"""
+        if not tiles:
+            return []
+        width = self.astar.width
+        return TilePath(array("i", [y * width + x for x, y in tiles]), width)
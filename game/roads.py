@@ -1,4 +1,4 @@
-import pygame as pg
+from .assets import assets
 
 class Road:
     def __init__(self, pos, resource_manager=None):
@@ -63,22 +63,22 @@ class Road:
             screen.blit(self.image, (self.rect.x + camera.scroll.x, self.rect.y + camera.scroll.y))
 
     def load_images(self):
-        # Load road textures
-        straight_13 = pg.image.load("assets/graphics/road_tiles/road_1.png").convert_alpha()
-        straight_24 = pg.image.load("assets/graphics/road_tiles/road_2.png").convert_alpha()
-        curve_12 = pg.image.load("assets/graphics/road_tiles/road_3.png").convert_alpha()
-        curve_34 = pg.image.load("assets/graphics/road_tiles/road_4.png").convert_alpha()
-        curve_14 = pg.image.load("assets/graphics/road_tiles/road_5.png").convert_alpha()
-        curve_23 = pg.image.load("assets/graphics/road_tiles/road_6.png").convert_alpha()
-        T_134 = pg.image.load("assets/graphics/road_tiles/road_7.png").convert_alpha()
-        T_234 = pg.image.load("assets/graphics/road_tiles/road_8.png").convert_alpha()
-        T_123 = pg.image.load("assets/graphics/road_tiles/road_9.png").convert_alpha()
-        T_124 = pg.image.load("assets/graphics/road_tiles/road_13.png").convert_alpha()
-        end_2 = pg.image.load("assets/graphics/road_tiles/road_10.png").convert_alpha()
-        end_1 = pg.image.load("assets/graphics/road_tiles/road_11.png").convert_alpha()
-        end_4 = pg.image.load("assets/graphics/road_tiles/road_12.png").convert_alpha()
-        end_3 = pg.image.load("assets/graphics/road_tiles/road_15.png").convert_alpha()
-        crossroad = pg.image.load("assets/graphics/road_tiles/road_14.png").convert_alpha()
+        # Shared road textures, loaded once for every road tile
+        straight_13 = assets.sprite("assets/graphics/road_tiles/road_1.png")
+        straight_24 = assets.sprite("assets/graphics/road_tiles/road_2.png")
+        curve_12 = assets.sprite("assets/graphics/road_tiles/road_3.png")
+        curve_34 = assets.sprite("assets/graphics/road_tiles/road_4.png")
+        curve_14 = assets.sprite("assets/graphics/road_tiles/road_5.png")
+        curve_23 = assets.sprite("assets/graphics/road_tiles/road_6.png")
+        T_134 = assets.sprite("assets/graphics/road_tiles/road_7.png")
+        T_234 = assets.sprite("assets/graphics/road_tiles/road_8.png")
+        T_123 = assets.sprite("assets/graphics/road_tiles/road_9.png")
+        T_124 = assets.sprite("assets/graphics/road_tiles/road_13.png")
+        end_2 = assets.sprite("assets/graphics/road_tiles/road_10.png")
+        end_1 = assets.sprite("assets/graphics/road_tiles/road_11.png")
+        end_4 = assets.sprite("assets/graphics/road_tiles/road_12.png")
+        end_3 = assets.sprite("assets/graphics/road_tiles/road_15.png")
+        crossroad = assets.sprite("assets/graphics/road_tiles/road_14.png")
 
         return {
             "straight_13": straight_13,
@@ -0,0 +1,66 @@
+import heapq
+from itertools import count
+from .settings import SCHEDULE_BUDGET
+
+class Scheduler:
+    def __init__(self, clock):
+        """Runs each entity's update only when it is due instead of every simulation step"""
+        self.clock = clock
+        self.queue = []  # heap of (due, order, entity), entries that don't match self.due are stale
+        self.due = {}  # entity -> simulated time of its next update
+        self.order = {}  # entity -> registration order, keeps entities due together in the order they were added
+        self.counter = count()
+        self.work_done = 0  # expensive updates run since the budget was renewed, limited by SCHEDULE_BUDGET
+        self.budget_per_step = True  # headless runs renew the budget every step, the game once per rendered frame
+
+    def add(self, entity):
+        """Registers an entity, its first update runs on the next step"""
+        self.order[entity] = next(self.counter)
+        self.wake(entity)
+
+    def remove(self, entity):
+        self.due.pop(entity, None)
+        self.order.pop(entity, None)
+
+    def wake(self, entity, delay=0):
+        """Schedules the next update of an entity delay milliseconds from now, sooner updates win"""
+        if entity not in self.order:
+            return
+        due = self.clock.get_ticks() + delay
+        if entity in self.due and self.due[entity] <= due:
+            return
+        self.due[entity] = due
+        heapq.heappush(self.queue, (due, self.order[entity], entity))
+
+    def update(self):
+        """Runs the updates that are due
+
+        update() returns the milliseconds until the entity needs its next update, 0 to run on every step
+        while it moves or animates, or None to sleep until something wakes it."""
+        now = self.clock.get_ticks()
+        if self.budget_per_step:
+            self.renew_budget()
+        due_entities = []
+        while self.queue and self.queue[0][0] <= now:
+            due, _, entity = heapq.heappop(self.queue)
+            if self.due.get(entity) == due:
+                del self.due[entity]
+                due_entities.append(entity)
+
+        for entity in due_entities:
+            if entity not in self.order: # removed by an earlier update this step
+                continue
+            delay = entity.update()
+            if delay is not None:
+                self.wake(entity, max(delay, 0))
+
+    def renew_budget(self):
+        """Allows SCHEDULE_BUDGET more expensive updates, called every rendered frame or, in headless runs, every step"""
+        self.work_done = 0
+
+    def take_work(self):
+        """Returns whether an expensive update may run before the budget is renewed, entities that get False try again next step"""
+        if self.work_done >= SCHEDULE_BUDGET:
+            return False
+        self.work_done += 1
+        return True
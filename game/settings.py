@@ -6,8 +6,29 @@ FULLSCREEN = True
 TILE_SIZE = 64
 WORLD_SIZE = 30
 CAMERA_SPEED = 12
+RENDER_MARGIN = 2 # extra tiles drawn around the screen edges for tall sprites
+CHUNK_SIZE = 8 # tiles per side of a pre-baked terrain chunk
+CHUNK_CACHE_SIZE = 64 # baked terrain chunks kept in memory
 MOISTURE_MULTIPLIER = 20
 ELECTRICITY_MULTIPLIER = 16
 WATER_PUMP_COST_MULTIPLIER = 0.3
 SOLAR_PANEL_CLEANING_COST_MULTIPLIER = 0.15
+TEXT_CACHE_SIZE = 256 # rendered text surfaces kept in memory
+DIRTY_RECTS = False # only redraw the changed parts of the screen while the camera is still
+DIRTY_RECT_LIMIT = 8 # above this many changed areas the whole screen is redrawn
+DIRTY_RECT_AREA = 0.3 # above this share of the screen changed the whole screen is redrawn
+SIM_TICK = 20 # milliseconds of simulated time per simulation step, independent of the frame rate
+SIM_SPEEDS = [1, 4, 16] # simulation speeds selected with the 1, 2 and 3 keys
+ECONOMY_TICK = 1000 # milliseconds of simulated time between production and consumption of all buildings
+SCHEDULE_WINDOW = 2500 # milliseconds of simulated time over which citizens leave after their schedule hour starts
+SCHEDULE_BUDGET = 2 # most citizen schedule changes (workplace search and pathfinding) run in one rendered frame, or one step headless
+JOB_OCCUPANCY_COST = 4 # road tiles a citizen would rather walk than join a factory with one more worker
+LOGISTICS_BATCH = 500 # milliseconds of simulated time between assignments of the waiting resource agents
+LOGISTICS_HORIZON = 10 # economy ticks of consumption the resource agents try to keep in stock at every building
+PATH_CACHE_SIZE = 1024 # paths along the roads kept in memory
+FIELD_CACHE_SIZE = 64 # distance fields to popular destinations kept in memory
+CLUSTER_SIZE = 10 # tiles per side of the clusters long paths are planned over
+FIELD_MIN_REQUESTS = 3 # paths asked to a road tile before paths there follow its distance field instead of searching
+REPLAN_BUDGET = 4 # most paths re-planned around a removed road in one simulation step
+MAX_SIM_STEPS = 100 # most simulation steps run in one frame, the rest of a long hitch is dropped
 TEXT_SIZE = 28 * VERTICAL_RESOLUTION/1080 # scaling proportionate to resolution
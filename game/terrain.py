@@ -0,0 +1,101 @@
+import random
+import numpy as np
+
+class TerrainGenerator:
+    def __init__(self, seed, grid_length_x, grid_length_y):
+        """Generates the elevation, moisture and biome grids of a world in one batch"""
+        self.seed = seed
+        self.grid_length_x = grid_length_x
+        self.grid_length_y = grid_length_y
+        self.perlin_scale = grid_length_x/2
+
+    def generate(self):
+        """Returns the terrain grids as numpy arrays indexed by [grid_x, grid_y]"""
+        # Add seed to coordinates for unique but consistent generation
+        base_x = np.arange(self.grid_length_x, dtype=np.float64) + self.seed * 0.1
+        base_y = np.arange(self.grid_length_y, dtype=np.float64) + self.seed * 0.1
+        base_x, base_y = np.meshgrid(base_x, base_y, indexing="ij")
+
+        # Calculate elevation using multiple octaves (2D noise)
+        elevation = np.zeros(base_x.shape)
+        amplitude = 1.1
+        frequency = 1.0
+        persistence = 0.5
+        octaves = 2
+
+        for i in range(octaves):
+            elevation += amplitude * self.perlin(base_x / self.perlin_scale * frequency,
+                                                 base_y / self.perlin_scale * frequency,
+                                                 int(self.seed), 1)
+            amplitude *= persistence
+            frequency *= 2
+
+        # Calculate moisture (2D noise)
+        moisture = self.perlin(base_x / self.perlin_scale * 2, base_y / self.perlin_scale * 2, int(self.seed + 1), 2)
+
+        # Normalize values
+        elevation = (elevation + 1) / 2
+        moisture = (moisture + 1) / 2
+
+        # Use seeded random for consistent variation, drawn in the same order as the tiles are created
+        random_variation = np.array([random.random() for i in range(self.grid_length_x * self.grid_length_y)])
+        random_variation = random_variation.reshape(self.grid_length_x, self.grid_length_y)
+
+        return {
+            "elevation": elevation,
+            "moisture": moisture,
+            "tile": self.biomes(elevation, moisture, random_variation),
+        }
+
+    def biomes(self, elevation, moisture, random_variation):
+        """Biome determination for every tile at once"""
+        land = elevation > 0.41
+        rare = land & (random_variation < 0.04)
+        conditions = [
+            elevation <= 0.35,
+            elevation <= 0.41,  # Mud around water
+            land & (elevation > 0.8),
+            land & (moisture > 0.6) & (elevation < 0.7),
+            rare & (moisture > 0.4),
+            rare & (elevation > 0.58),  # interpret higher elevation as rocks
+        ]
+        choices = ["water", "mud", "rock", "trees", "trees", "rock"]
+        return np.select(conditions, choices, default="")
+
+    def perlin(self, x, y, seed, octaves):
+        """Vectorized equivalent of perlin_noise.PerlinNoise(octaves, seed)([x, y])"""
+        x = x * octaves
+        y = y * octaves
+        x0 = np.floor(x)
+        y0 = np.floor(y)
+
+        # The lattice only spans a handful of cells, so the gradients are looked up from a small table
+        min_x, min_y = int(x0.min()), int(y0.min())
+        vectors = self.gradient_table(min_x, int(x0.max()) + 1, min_y, int(y0.max()) + 1, seed)
+        ix = (x0 - min_x).astype(np.intp)
+        iy = (y0 - min_y).astype(np.intp)
+
+        value = np.zeros(x.shape)
+        # corners are summed in the same order as itertools.product in perlin_noise
+        for cx, cy in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+            dist_x = x - (x0 + cx)
+            dist_y = y - (y0 + cy)
+            vec = vectors[ix + cx, iy + cy]
+            weight = self.fade(1 - np.abs(dist_x)) * self.fade(1 - np.abs(dist_y))
+            value = value + weight * (vec[..., 0] * dist_x + vec[..., 1] * dist_y)
+        return value
+
+    def gradient_table(self, min_x, max_x, min_y, max_y, seed):
+        """Random gradient vectors of the lattice corners, seeded the same way as perlin_noise"""
+        state = random.getstate()
+        table = np.zeros((max_x - min_x + 1, max_y - min_y + 1, 2))
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                random.seed(seed * max(1, int(abs(cx + 10 * cy + 1))))
+                table[cx - min_x, cy - min_y] = (random.uniform(-1, 1), random.uniform(-1, 1))
+        random.setstate(state)
+        return table
+
+    def fade(self, value):
+        """Smoothing of [0, 1] values"""
+        return 6 * np.power(value, 5) - 15 * np.power(value, 4) + 10 * np.power(value, 3)
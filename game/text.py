@@ -0,0 +1,67 @@
+import pygame as pg
+from collections import OrderedDict
+from .settings import TEXT_CACHE_SIZE
+
+class TextRenderer:
+    def __init__(self):
+        """Renders text with fonts cached per size and rendered surfaces cached per (text, size, color)"""
+        self.fonts = {}
+        self.surfaces = OrderedDict()  # least recently used first
+        self.layouts = {}
+
+        # Caching statistics for performance tracking
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        """Returns the font of the given size, creating it on first use"""
+        size = int(size)
+        if size not in self.fonts:
+            self.fonts[size] = pg.font.SysFont(None, size)
+        return self.fonts[size]
+
+    def render(self, text, size, color):
+        """Returns the rendered surface of a text, rendering it only if it is not cached"""
+        key = (text, int(size), tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > TEXT_CACHE_SIZE:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def wrap(self, text, size, max_width):
+        """Splits a text into lines no wider than max_width, the layout is cached"""
+        key = (text, int(size), int(max_width))
+        if key in self.layouts:
+            return self.layouts[key]
+
+        font = self.font(size)
+        lines = []
+        line = ''
+        for word in text.split(' '):
+            test_line = line + word + ' '
+            if font.size(test_line)[0] > max_width:
+                lines.append(line)
+                line = word + ' '
+            else:
+                line = test_line
+        if line:
+            lines.append(line)
+
+        self.layouts[key] = lines
+        return lines
+
+    def hit_rate(self):
+        """Returns the percentage of rendered texts served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total * 100 if total > 0 else 0
+
+# shared by every screen of the game
+text_renderer = TextRenderer()
@@ -1,9 +1,23 @@
 import pygame as pg
+from .text import text_renderer
 
 def draw_text(screen, text, size, color, pos):
     """Draws text on the screen."""
-    font = pg.font.SysFont(None, int(size))
-    text_surface = font.render(text, True, color)
+    text_surface = text_renderer.render(text, size, color)
     text_rect = text_surface.get_rect(topleft=pos)
 
     screen.blit(text_surface, text_rect)
+
+def merge_rects(rects, bounds):
+    """Merges overlapping rectangles until none overlap, clipped to bounds."""
+    merged = []
+    for rect in rects:
+        rect = pg.Rect(rect).clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
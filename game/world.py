@@ -1,10 +1,20 @@
 import pygame as pg
+from .assets import assets
 import random
 import math
-import perlin_noise as noise
-from .settings import TILE_SIZE, ELECTRICITY_MULTIPLIER, MOISTURE_MULTIPLIER
+from .terrain import TerrainGenerator
+from .settings import TILE_SIZE, RENDER_MARGIN, ELECTRICITY_MULTIPLIER, MOISTURE_MULTIPLIER
 from .buildings import Residential_Building, Factory, Solar_Panels, Water_Treatment_Plant
 from .roads import Road
+from .chunks import TerrainChunks
+from .overlay import Overlay
+from .economy import Economy
+from .scheduler import Scheduler
+from .jobs import JobMarket
+from .registry import SpatialRegistry
+from .logistics import Logistics
+from .road_network import RoadNetwork
+from .path_index import PathIndex
 
 class World:
     def __init__(self, buildings, resource_manager, entities, hud, clock, grid_length_x, grid_length_y, width, height, seed=None):
@@ -15,6 +25,9 @@ class World:
         self.hud = hud
         self.hud.world = self
         self.clock = clock
+        self.economy = Economy(resource_manager, clock)
+        self.scheduler = Scheduler(clock)
+        self.jobs = JobMarket(self)
         self.grid_length_x = grid_length_x
         self.grid_length_y = grid_length_y
         self.width = width
@@ -24,8 +37,6 @@ class World:
         self.seed = seed if seed is not None else random.randint(0, 999999)
         random.seed(self.seed)
 
-        self.perlin_scale = grid_length_x/2
-
         # animation variables
         self.animation_frame = 0
         self.animation_speed = 0.2  # Controls how fast frames change
@@ -38,9 +49,18 @@ class World:
         self.warning_speed = 0.1
         self.warning_max_bounce = 3
 
-        self.grass_tiles = pg.Surface((grid_length_x * TILE_SIZE * 2, grid_length_y * TILE_SIZE + 2 * TILE_SIZE)).convert_alpha()
+        # day/night tint for every minute of the day
+        self.tint_table = self.create_tint_table()
+        self.tint = None  # tint the blend surfaces are filled with
+        self.tint_surfaces = None
+
+        # horizontal offset that moves the isometric world to positive x coordinates
+        self.render_offset_x = grid_length_x * TILE_SIZE
         self.tiles = self.load_images()
+        # trees and rocks stand up from the ground, so they are drawn in depth order instead of baked into the terrain
+        self.decorations = {"trees": assets.sprite("assets/graphics/trees.png"), "rock": assets.sprite("assets/graphics/rock.png")}
         self.world = self.create_world()
+        self.terrain_chunks = TerrainChunks(self)
         self.collision_matrix = self.create_collision_matrix()
 
         # grid maps of objects
@@ -48,11 +68,27 @@ class World:
         self.roads = [[None for x in range(self.grid_length_x)] for y in range(self.grid_length_y)]
         self.citizens = [[[] for x in range(self.grid_length_x)] for y in range(self.grid_length_y)]
         self.resource_agents = [[[] for x in range(self.grid_length_x)] for y in range(self.grid_length_y)]
+        self.registry = SpatialRegistry(self)  # road tiles and the roads buildings use
+        self.road_network = RoadNetwork(self)  # connected parts of the road network
+        self.paths = PathIndex(self)  # citizens and agents by the tiles their paths cross
+        self.logistics = Logistics(self)
         self.show_agents = True
+        self.crowd_offsets = {}  # circle offsets of entities sharing a tile, by (index, count)
 
         # tile variables for hud
         self.temp_tile = None
         self.examine_tile = None
+        self.hovered_tile = None  # grid position under the mouse, updated once per frame
+        self.overlay = Overlay(self)
+
+        # frame state for dirty rectangle rendering
+        self.draw_list = []
+        self.moving_sprites = set()  # (screen area, image, tile) of the sprites that can change without the camera moving
+        self.water_rects = []  # screen areas of the visible animated water tiles
+        self.last_frame_state = None
+        self.last_moving_sprites = set()
+        self.last_animation_frame = None
+        self.world_changed = False
 
         # sounds
         self.click_sound = pg.mixer.Sound('assets/audio/click.wav')
@@ -79,6 +115,52 @@ class World:
                 if neighbor_road:
                     neighbor_road.update_texture((nx, ny), self.roads)
 
+    def terrain_sprites(self, tile):
+        """Returns the sprite of the trees or rock standing on a tile, if any"""
+        image = self.decorations.get(tile["tile"])
+        if image is None:
+            return []
+        render_pos = tile["render_pos"]
+        return [(image, render_pos[0] + self.render_offset_x, render_pos[1] - (image.get_height() - 2 * TILE_SIZE))]
+
+    def update_sprites(self, grid_pos):
+        """Precomputes the world positions of the terrain, road and building sprites of a tile and its neighbours"""
+        for x, y in [grid_pos, (grid_pos[0], grid_pos[1] - 1), (grid_pos[0] + 1, grid_pos[1]),
+                     (grid_pos[0], grid_pos[1] + 1), (grid_pos[0] - 1, grid_pos[1])]:
+            if 0 <= x < self.grid_length_x and 0 <= y < self.grid_length_y:
+                tile = self.world[x][y]
+                render_pos = tile["render_pos"]
+                tile["sprites"] = self.terrain_sprites(tile)
+                tile["warning_pos"] = None
+                for entity in [self.roads[x][y], self.buildings[x][y]]:
+                    if entity is not None:
+                        sprite_x = render_pos[0] + self.render_offset_x
+                        sprite_y = render_pos[1] - (entity.image.get_height() - 2 * TILE_SIZE)
+                        tile["sprites"].append((entity.image, sprite_x, sprite_y))
+                        if entity is self.buildings[x][y]:
+                            # Offset above the building
+                            tile["warning_pos"] = (sprite_x + entity.image.get_width() // 2, sprite_y - 30)
+        self.world_changed = True
+
+    def crowd_offset(self, index, count):
+        """Returns the offset of an entity among count entities on the same tile"""
+        key = (index, count)
+        if key not in self.crowd_offsets:
+            # Create a circular pattern around the center point
+            radius = 12  # Radius of the circle
+            angle = (index * 2 * 3.14159) / min(count, 8)  # Distribute evenly around the circle
+            x_offset = int(radius * math.cos(angle))
+            y_offset = int(radius * math.sin(angle))
+
+            # For more than 8 entities, create an outer circle
+            if index >= 8:
+                outer_radius = 20
+                outer_angle = ((index - 8) * 2 * 3.14159) / min(count - 8, 12)
+                x_offset = int(outer_radius * math.cos(outer_angle))
+                y_offset = int(outer_radius * math.sin(outer_angle))
+            self.crowd_offsets[key] = (x_offset, y_offset)
+        return self.crowd_offsets[key]
+
     def update(self, clock, camera):
         """Logic that updates every frame"""
         self.camera = camera
@@ -98,6 +180,10 @@ class World:
         mouse_pos = pg.mouse.get_pos()
         mouse_action = pg.mouse.get_pressed()
 
+        # find the hovered tile once for the whole frame
+        grid_pos = self.mouse_to_grid(mouse_pos[0], mouse_pos[1], camera.scroll)
+        self.hovered_tile = grid_pos if self.can_place_tile(grid_pos) else None
+
         # on right click stop examining tile
         if mouse_action[2]:
             self.examine_tile = None
@@ -106,9 +192,7 @@ class World:
         self.temp_tile = None
         if self.hud.selected_tile is not None and not self.hud.delete_mode:
             # placing objects
-            grid_pos = self.mouse_to_grid(mouse_pos[0], mouse_pos[1], camera.scroll)
-
-            if self.can_place_tile(grid_pos):
+            if self.hovered_tile is not None:
                 img = self.hud.selected_tile["image"].copy()
                 img.set_alpha(100)
 
@@ -141,280 +225,248 @@ class World:
                         "buildable": buildable and self.resource_manager.is_affordable(self.hud.selected_tile["name"]) and building_can_be_placed_here,
                         "empty": empty,
                         "user_built": user_built,
-                        "road_access": self.check_adjacent_roads(grid_pos),  # Check if there are adjacent roads
+                        "road_access": self.check_adjacent_roads(grid_pos, self.hud.selected_tile["name"]),  # Check if there are adjacent roads
+                        "connected": self.road_network.joins_main(grid_pos),  # whether it joins the largest part of the road network
                         "water_resource": tile_type == "mud" and self.hud.selected_tile["name"] == "water_treatment_plant",
                     }
 
-                # Special placement conditions for water treatment plant
-                if self.hud.selected_tile["name"] == "water_treatment_plant" and tile_type == "mud":
-                    can_place = (
-                        mouse_action[0] and
-                        self.check_adjacent_roads(grid_pos) and
-                        self.buildings[grid_pos[0]][grid_pos[1]] is None and
-                        self.roads[grid_pos[0]][grid_pos[1]] is None and
-                        self.resource_manager.is_affordable(self.hud.selected_tile["name"])
-                    )
-                # Special placement conditions for roads on mud
-                elif self.hud.selected_tile["name"] == "road" and tile_type == "mud":
-                    can_place = (
-                        mouse_action[0] and
-                        self.roads[grid_pos[0]][grid_pos[1]] is None and
-                        self.buildings[grid_pos[0]][grid_pos[1]] is None and
-                        self.resource_manager.is_affordable(self.hud.selected_tile["name"])
-                    )
-                else:
-                    # Normal placement conditions for other buildings
-                    can_place = (
-                        mouse_action[0] and
-                        buildable and
-                        self.check_adjacent_roads(grid_pos) and
-                        self.buildings[grid_pos[0]][grid_pos[1]] is None and
-                        self.roads[grid_pos[0]][grid_pos[1]] is None and
-                        building_can_be_placed_here and
-                        self.resource_manager.is_affordable(self.hud.selected_tile["name"])
-                    )
-
-                if can_place:
-                    ent = None
-                    match self.hud.selected_tile["name"]:
-                        case "road":
-                            ent = Road(self.world[grid_pos[0]][grid_pos[1]]["render_pos"], self.resource_manager)
-                            self.world[grid_pos[0]][grid_pos[1]]["walkable"] = True
-                            # Update collision matrix to allow pathing through this tile
-                            self.collision_matrix[grid_pos[1]][grid_pos[0]] = 1
-                            self.roads[grid_pos[0]][grid_pos[1]] = ent
-                            self.update_road_textures(grid_pos)
-                        case "factory":
-                            ent = Factory(render_pos, self.resource_manager, self, grid_pos)
-                            self.buildings[grid_pos[0]][grid_pos[1]] = ent
-                        case "residential_building":
-                            ent = Residential_Building(render_pos, self.resource_manager, self, grid_pos)
-                            self.buildings[grid_pos[0]][grid_pos[1]] = ent
-                        case "solar_panels":
-                            ent = Solar_Panels(render_pos, self.resource_manager, self, grid_pos)
-                            electricity_production_rate = round(self.world[grid_pos[0]][grid_pos[1]]["elevation"]*ELECTRICITY_MULTIPLIER)
-                            water_consumption_rate = round(ent.water_consumption + electricity_production_rate*0.15)
-                            ent.electricity_production_rate = electricity_production_rate
-                            ent.water_consumption = water_consumption_rate
-                            self.buildings[grid_pos[0]][grid_pos[1]] = ent
-                        case "water_treatment_plant":
-                            ent = Water_Treatment_Plant(render_pos, self.resource_manager, self, grid_pos)
-                            water_production_rate = round(self.world[grid_pos[0]][grid_pos[1]]["moisture"]*MOISTURE_MULTIPLIER)
-                            electricity_consumption_rate = round(ent.electricity_consumption + water_production_rate*0.3)
-                            ent.water_production_rate = water_production_rate
-                            ent.electricity_consumption = electricity_consumption_rate
-                            self.buildings[grid_pos[0]][grid_pos[1]] = ent
-                    # add the created entity to the list
-                    self.entities.append(ent)
-                    if self.world[grid_pos[0]][grid_pos[1]]["tile"] == "trees":
-                        self.world[grid_pos[0]][grid_pos[1]]["tile"] = ""
-                    self.world[grid_pos[0]][grid_pos[1]]["buildable"] = False
-                    self.world[grid_pos[0]][grid_pos[1]]["empty"] = False
-                    if self.hud.selected_tile["name"] == "road":
-                        # Only mark road tiles as walkable
-                        self.world[grid_pos[0]][grid_pos[1]]["walkable"] = True
-                    else:
-                        # Only update collision matrix for non-road buildings
-                        self.collision_matrix[grid_pos[1]][grid_pos[0]] = 0
-                    self.world[grid_pos[0]][grid_pos[1]]["user_built"] = True
+                if mouse_action[0] and self.can_place(grid_pos, self.hud.selected_tile["name"]):
+                    self.place(grid_pos, self.hud.selected_tile["name"])
                     self.click_sound.play()
 
         elif self.hud.delete_mode and mouse_action[0]:  # Check if delete mode is active and left-click
             self.temp_tile = None
-            grid_pos = self.mouse_to_grid(mouse_pos[0], mouse_pos[1], camera.scroll)
-            if self.can_place_tile(grid_pos):
-                building = self.buildings[grid_pos[0]][grid_pos[1]]
-                if building is not None:
-                    # If a factory is being demolished, its workers need to find new jobs
-                    if building.name == "factory" and hasattr(building, 'worker_count') and building.worker_count > 0:
-                        # Find all citizens that might be working here
-                        for entity in self.entities:
-                            if hasattr(entity, 'workplace') and entity.workplace == building:
-                                # Reset this citizen's workplace and make them find a new one
-                                entity.workplace = None
-                                entity.workplace_grid_pos = None
-                                entity.find_workplace()
-                    # Remove building
-                    self.click_sound.play()
-                    self.entities.remove(building)
-                    self.buildings[grid_pos[0]][grid_pos[1]] = None
-                road = self.roads[grid_pos[0]][grid_pos[1]]
-                if road is not None:
-                    # Remove road
+            if self.hovered_tile is not None:
+                if self.demolish(grid_pos):
                     self.click_sound.play()
-                    self.entities.remove(road)
-                    self.roads[grid_pos[0]][grid_pos[1]] = None
-                if self.world[grid_pos[0]][grid_pos[1]]["tile"] != "mud":
-                    self.world[grid_pos[0]][grid_pos[1]]["buildable"] = True
-                self.world[grid_pos[0]][grid_pos[1]]["empty"] = True
-                self.world[grid_pos[0]][grid_pos[1]]["walkable"] = True
-                self.world[grid_pos[0]][grid_pos[1]]["user_built"] = False
-                self.collision_matrix[grid_pos[1]][grid_pos[0]] = 1
-
-                # Update road textures after deletion
-                self.update_road_textures(grid_pos)
         else:
             # navigation and selection
-            grid_pos = self.mouse_to_grid(mouse_pos[0], mouse_pos[1], camera.scroll)
-            if self.can_place_tile(grid_pos):
+            if self.hovered_tile is not None:
                 building = self.buildings[grid_pos[0]][grid_pos[1]]
                 if mouse_action[0] and (building is not None):
                     self.examine_tile = grid_pos
                     self.hud.examined_tile = building
 
+    def can_place(self, grid_pos, name):
+        """Checks whether a building or road can be placed on a tile"""
+        tile_type = self.world[grid_pos[0]][grid_pos[1]]["tile"]
+        if (self.buildings[grid_pos[0]][grid_pos[1]] is not None or self.roads[grid_pos[0]][grid_pos[1]] is not None or
+                not self.resource_manager.is_affordable(name)):
+            return False
+
+        # Special placement conditions for water treatment plant, it can only be built on mud
+        if name == "water_treatment_plant":
+            return tile_type == "mud" and self.check_adjacent_roads(grid_pos, name)
+        # Special placement conditions for roads on mud
+        if name == "road" and tile_type == "mud":
+            return True
+        # Normal placement conditions for other buildings
+        return self.world[grid_pos[0]][grid_pos[1]]["buildable"] and self.check_adjacent_roads(grid_pos, name)
+
+    def place(self, grid_pos, name):
+        """Builds a building or road on a tile and returns it"""
+        render_pos = self.world[grid_pos[0]][grid_pos[1]]["render_pos"]
+        ent = None
+        match name:
+            case "road":
+                ent = Road(render_pos, self.resource_manager)
+                self.world[grid_pos[0]][grid_pos[1]]["walkable"] = True
+                # Update collision matrix to allow pathing through this tile
+                self.collision_matrix[grid_pos[1]][grid_pos[0]] = 1
+                self.roads[grid_pos[0]][grid_pos[1]] = ent
+                self.update_road_textures(grid_pos)
+            case "factory":
+                ent = Factory(render_pos, self.resource_manager, self, grid_pos)
+                self.buildings[grid_pos[0]][grid_pos[1]] = ent
+                self.jobs.add_factory(ent)
+            case "residential_building":
+                ent = Residential_Building(render_pos, self.resource_manager, self, grid_pos)
+                self.buildings[grid_pos[0]][grid_pos[1]] = ent
+            case "solar_panels":
+                ent = Solar_Panels(render_pos, self.resource_manager, self, grid_pos)
+                electricity_production_rate = round(self.world[grid_pos[0]][grid_pos[1]]["elevation"]*ELECTRICITY_MULTIPLIER)
+                water_consumption_rate = round(ent.water_consumption + electricity_production_rate*0.15)
+                ent.electricity_production_rate = electricity_production_rate
+                ent.water_consumption = water_consumption_rate
+                self.buildings[grid_pos[0]][grid_pos[1]] = ent
+            case "water_treatment_plant":
+                ent = Water_Treatment_Plant(render_pos, self.resource_manager, self, grid_pos)
+                water_production_rate = round(self.world[grid_pos[0]][grid_pos[1]]["moisture"]*MOISTURE_MULTIPLIER)
+                electricity_consumption_rate = round(ent.electricity_consumption + water_production_rate*0.3)
+                ent.water_production_rate = water_production_rate
+                ent.electricity_consumption = electricity_consumption_rate
+                self.buildings[grid_pos[0]][grid_pos[1]] = ent
+        # add the created entity to the list
+        self.entities.append(ent)
+        self.scheduler.add(ent)
+        self.registry.add(grid_pos, ent)
+        if name == "road":
+            self.road_network.add_road(grid_pos)
+            self.paths.road_added(grid_pos)
+        else:
+            self.logistics.add(ent)
+        if self.world[grid_pos[0]][grid_pos[1]]["tile"] == "trees":
+            self.world[grid_pos[0]][grid_pos[1]]["tile"] = ""
+        self.update_sprites(grid_pos)
+        self.world[grid_pos[0]][grid_pos[1]]["buildable"] = False
+        self.world[grid_pos[0]][grid_pos[1]]["empty"] = False
+        if name == "road":
+            # Only mark road tiles as walkable
+            self.world[grid_pos[0]][grid_pos[1]]["walkable"] = True
+        else:
+            # Only update collision matrix for non-road buildings
+            self.collision_matrix[grid_pos[1]][grid_pos[0]] = 0
+        self.world[grid_pos[0]][grid_pos[1]]["user_built"] = True
+        return ent
+
+    def demolish(self, grid_pos):
+        """Removes the building and road on a tile, returns whether anything was removed"""
+        demolished = False
+        building = self.buildings[grid_pos[0]][grid_pos[1]]
+        if building is not None:
+            # If a factory is being demolished, its workers need to find new jobs
+            if building.name == "factory":
+                self.jobs.remove_factory(building)
+            # Remove building
+            demolished = True
+            self.entities.remove(building)
+            self.scheduler.remove(building)
+            self.economy.remove(building)
+            self.buildings[grid_pos[0]][grid_pos[1]] = None
+            self.registry.remove(grid_pos, building)
+            self.logistics.remove(building)
+        road = self.roads[grid_pos[0]][grid_pos[1]]
+        if road is not None:
+            # Remove road
+            demolished = True
+            self.entities.remove(road)
+            self.scheduler.remove(road)
+            self.roads[grid_pos[0]][grid_pos[1]] = None
+            self.registry.remove(grid_pos, road)
+            self.road_network.remove_road(grid_pos)
+            self.paths.road_removed(grid_pos)
+        if self.world[grid_pos[0]][grid_pos[1]]["tile"] != "mud":
+            self.world[grid_pos[0]][grid_pos[1]]["buildable"] = True
+        self.world[grid_pos[0]][grid_pos[1]]["empty"] = True
+        self.world[grid_pos[0]][grid_pos[1]]["walkable"] = True
+        self.world[grid_pos[0]][grid_pos[1]]["user_built"] = False
+        self.collision_matrix[grid_pos[1]][grid_pos[0]] = 1
+
+        # Update road textures after deletion
+        self.update_road_textures(grid_pos)
+        self.update_sprites(grid_pos)
+        return demolished
+
     def draw(self, screen, camera):
         """draw logic for the world class"""
-        screen.blit(self.grass_tiles, (camera.scroll.x, camera.scroll.y))
-        # Get the game time from the HUD if available
-        game_time = getattr(self.hud, 'game_time', 12)  # Default to noon if not available
-        for x in range(self.grid_length_x):
-            for y in range(self.grid_length_y):
-                render_pos = self.world[x][y]["render_pos"]
-                # draw world tiles
-                tile = self.world[x][y]["tile"]
-                if tile != "":
-                    if tile == "water":
-                        # Render animated water frame
-                        water_frame = self.water_frames[self.animation_frame % len(self.water_frames)]
-                        screen.blit(water_frame,
-                                    (render_pos[0] + self.grass_tiles.get_width()/2 + camera.scroll.x,
-                                    render_pos[1] - (water_frame.get_height() - 2 * TILE_SIZE) + camera.scroll.y))
-                    else:
-                        # Render other tiles normally
-                        screen.blit(self.tiles[tile],
-                                    (render_pos[0] + self.grass_tiles.get_width()/2 + camera.scroll.x,
-                                    render_pos[1] - (self.tiles[tile].get_height() - 2 * TILE_SIZE) + camera.scroll.y))
-
-                # draw roads
-                road = self.roads[x][y]
-                if road is not None:
-                    screen.blit(road.image,
-                                (render_pos[0] + self.grass_tiles.get_width()/2 + camera.scroll.x,
-                                render_pos[1] - (road.image.get_height() - 2 * TILE_SIZE) + camera.scroll.y))
-                # draw buildings
+        self.prepare(screen, camera)
+        self.render(screen, camera)
+
+    def prepare(self, screen, camera):
+        """Builds the draw list of the frame and records the screen areas of everything animated"""
+        # only visit the tiles that can end up on the screen
+        visible_tiles = self.visible_tiles(screen, camera)
+        scroll_x = camera.scroll.x
+        scroll_y = camera.scroll.y
+        # screen offsets shared by every agent and citizen this frame
+        agent_x = self.render_offset_x + scroll_x + 20
+        agent_y = 1.5*TILE_SIZE + scroll_y - 15
+        citizen_x = self.render_offset_x + scroll_x
+        citizen_y = 1.5*TILE_SIZE + scroll_y
+
+        # flat terrain and animated water come from pre-baked chunks, then every sprite follows in depth order
+        draw_list = self.terrain_chunks.blit_list(camera, visible_tiles)
+        moving_sprites = set()
+        water_rects = []
+        for x, y_start, y_end in visible_tiles:
+            for y in range(y_start, y_end):
+                tile = self.world[x][y]
+                if tile["tile"] == "water":
+                    render_pos = tile["render_pos"]
+                    water_rects.append((render_pos[0] + self.render_offset_x + scroll_x, render_pos[1] + scroll_y, 2 * TILE_SIZE, 2 * TILE_SIZE))
+
+                # draw trees, rocks, roads and buildings, their positions only move with the camera
+                for image, sprite_x, sprite_y in tile["sprites"]:
+                    draw_list.append((image, (sprite_x + scroll_x, sprite_y + scroll_y)))
+
+                # Check if building has enough resources and draw warning if not
                 building = self.buildings[x][y]
-                if building is not None:
-                    # Draw the building image
-                    building_x = render_pos[0] + self.grass_tiles.get_width()/2 + camera.scroll.x
-                    building_y = render_pos[1] - (building.image.get_height() - 2 * TILE_SIZE) + camera.scroll.y
-                    screen.blit(building.image, (building_x, building_y))
-
-                    # Check if building has enough resources and draw warning if not
-                    if hasattr(building, 'check_has_resources') and not building.check_has_resources():
-                        # Factory has warning_image directly, other buildings through resources
-                        warning_image = None
-                        if hasattr(building, 'warning_image'):
-                            warning_image = building.warning_image
-                        elif hasattr(building, 'resources') and hasattr(building.resources, 'warning_image'):
-                            warning_image = building.resources.warning_image
-
-                        if warning_image:
-                            # Position the warning image above the building with bouncing animation
-                            warning_x = building_x + building.image.get_width() // 2 - warning_image.get_width() // 2
-                            warning_y = building_y - 30 + self.warning_bounce  # Offset above the building with bounce
-                            screen.blit(warning_image, (warning_x, warning_y))
-
-                    if self.examine_tile is not None:
-                        if (x==self.examine_tile[0] and y==self.examine_tile[1]):
-                            mask = pg.mask.from_surface(building.image).outline()
-                            mask = [(x + render_pos[0] + self.grass_tiles.get_width()/2 + camera.scroll.x,
-                                    y + render_pos[1] - (building.image.get_height() - 2 * TILE_SIZE) + camera.scroll.y
-                                    ) for x, y in mask]
-                            pg.draw.polygon(screen, (255, 255, 255), mask, 3)
+                # the flag is cached by the last economy tick
+                if building is not None and not building.check_has_resources():
+                    warning_image = building.warning_image
+                    # Position the warning image above the building with bouncing animation
+                    warning_x, warning_y = tile["warning_pos"]
+                    dest = (warning_x - warning_image.get_width() // 2 + scroll_x, warning_y + self.warning_bounce + scroll_y)
+                    draw_list.append((warning_image, dest))
+                    moving_sprites.add(((int(dest[0]), int(dest[1])) + warning_image.get_size(), warning_image, (x, y)))
 
                 # draw resource agents
-                agents_on_tile = self.resource_agents[x][y]
-                for i, agent in enumerate(agents_on_tile):
-                    # Add a small offset for each agent
-                    x_offset = 0
-                    y_offset = 0
-
-                    if len(agents_on_tile) >= 1:
-                        # Create a circular pattern around the center point
-                        radius = 12  # Radius of the circle
-                        angle = (i * 2 * 3.14159) / min(len(agents_on_tile), 8)  # Distribute evenly around the circle
-                        x_offset = int(radius * math.cos(angle))
-                        y_offset = int(radius * math.sin(angle))
-
-                        # For more than 8 agents, create an outer circle
-                        if i >= 8:
-                            outer_radius = 20
-                            outer_angle = ((i - 8) * 2 * 3.14159) / min(len(agents_on_tile) - 8, 12)
-                            x_offset = int(outer_radius * math.cos(outer_angle))
-                            y_offset = int(outer_radius * math.sin(outer_angle))
-
-                        if self.show_agents:
-                            screen.blit(agent.image,
-                                    (agent.current_pos.x + self.grass_tiles.get_width()/2 + camera.scroll.x + x_offset + 20,
-                                agent.current_pos.y - (agent.image.get_height() - 1.5*TILE_SIZE) + camera.scroll.y + y_offset-15))
+                if self.show_agents:
+                    agents_on_tile = self.resource_agents[x][y]
+                    for i, agent in enumerate(agents_on_tile):
+                        # Add a small offset for each agent
+                        x_offset, y_offset = self.crowd_offset(i, len(agents_on_tile))
+                        dest = (agent.current_pos.x + agent_x + x_offset, agent.current_pos.y - agent.image.get_height() + agent_y + y_offset)
+                        draw_list.append((agent.image, dest))
+                        moving_sprites.add(((int(dest[0]), int(dest[1])) + agent.image.get_size(), agent.image, (x, y)))
 
                 # draw citizens
                 citizens_on_tile = self.citizens[x][y]
                 for i, citizen in enumerate(citizens_on_tile):
-                    # Add a small offset for each citizen
-                    x_offset = 0
-                    y_offset = 0
-
-                    if len(citizens_on_tile) >= 1 and citizen.is_visible:
-                        # Create a circular pattern around the center point
-                        radius = 12  # Radius of the circle
-                        angle = (i * 2 * 3.14159) / min(len(citizens_on_tile), 8)  # Distribute evenly around the circle
-                        x_offset = int(radius * math.cos(angle))
-                        y_offset = int(radius * math.sin(angle))
-
-                        # For more than 8 citizens, create an outer circle
-                        if i >= 8:
-                            outer_radius = 20
-                            outer_angle = ((i - 8) * 2 * 3.14159) / min(len(citizens_on_tile) - 8, 12)
-                            x_offset = int(outer_radius * math.cos(outer_angle))
-                            y_offset = int(outer_radius * math.sin(outer_angle))
-
-                        screen.blit(citizen.image,
-                                (citizen.current_pos.x + self.grass_tiles.get_width()/2 + camera.scroll.x + x_offset,
-                                citizen.current_pos.y - (citizen.image.get_height() - 1.5*TILE_SIZE) + camera.scroll.y + y_offset))
-
-                # Draw red polygon around the tile in delete mode
-                if self.hud.delete_mode:
-                    grid_pos = self.mouse_to_grid(pg.mouse.get_pos()[0], pg.mouse.get_pos()[1], camera.scroll)
-                    if grid_pos == (x, y):
-                        iso_poly = self.world[x][y]["iso_poly"]
-                        iso_poly = [(px + self.grass_tiles.get_width() / 2 + camera.scroll.x,
-                                    py + camera.scroll.y + 0.5*TILE_SIZE) for px, py in iso_poly]
-
-                        # Create a transparent surface for the polygon
-                        polygon_surface = pg.Surface(screen.get_size(), pg.SRCALPHA)
-                        pg.draw.polygon(polygon_surface, (255, 0, 0, 128), iso_poly)  # Red with 50% transparency
-                        screen.blit(polygon_surface, (0, 0))
-
-        # Draw the temporary tile's polygon
-        if self.temp_tile is not None:
-            iso_poly = self.temp_tile["iso_poly"]
-            iso_poly = [(x + self.grass_tiles.get_width()/2 + camera.scroll.x, y - (self.temp_tile["image"].get_height() - 2.5*TILE_SIZE) + camera.scroll.y) for x, y in iso_poly]
-            if self.temp_tile["buildable"] or self.temp_tile["water_resource"] and self.hud.selected_tile["name"] == "water_treatment_plant":
-                pg.draw.polygon(screen, (255, 255, 255), iso_poly, 3)
-            elif self.temp_tile["user_built"]:
-                pg.draw.polygon(screen, (0, 0, 255), iso_poly, 3)
-            else:
-                pg.draw.polygon(screen, (255, 0, 0), iso_poly, 3)
-            render_pos = self.temp_tile["render_pos"]
-            screen.blit(self.temp_tile["image"],
-                        (
-                            render_pos[0] + self.grass_tiles.get_width()/2 + camera.scroll.x,
-                            render_pos[1] - (self.temp_tile["image"].get_height() - 2 * TILE_SIZE) + camera.scroll.y)
-                        )
-        # draw the day/night cycle overlay
-        self.day_night_cycle(screen, game_time)
+                    if citizen.is_visible:
+                        # Add a small offset for each citizen
+                        x_offset, y_offset = self.crowd_offset(i, len(citizens_on_tile))
+                        dest = (citizen.current_pos.x + citizen_x + x_offset, citizen.current_pos.y - citizen.image.get_height() + citizen_y + y_offset)
+                        draw_list.append((citizen.image, dest))
+                        moving_sprites.add(((int(dest[0]), int(dest[1])) + citizen.image.get_size(), citizen.image, (x, y)))
 
-    def day_night_cycle(self, screen, game_time):
+        self.draw_list = draw_list
+        self.moving_sprites = moving_sprites
+        self.water_rects = water_rects
+
+    def render(self, screen, camera):
+        """Draws the prepared frame, highlights and day/night tint"""
+        # Get the time of day from the HUD if available
+        time_of_day = getattr(self.hud, 'time_of_day', 12)  # Default to noon if not available
+
+        # a single call keeps the per-sprite overhead in C
+        screen.blits(self.draw_list, doreturn=False)
+
+        # selection outlines and hover, delete and placement highlights
+        self.overlay.draw(screen, camera)
+
+        # draw the day/night cycle overlay
+        self.day_night_cycle(screen, time_of_day)
+
+    def visible_tiles(self, screen, camera):
+        """Returns (x, y_start, y_end) column ranges of the tiles visible from the camera"""
+        # a tile at (x, y) is rendered at screen x = (x - y - 1) * TILE_SIZE + offset
+        # and screen y = (x + y) * TILE_SIZE / 2 + scroll, with a 2*TILE_SIZE sprite size
+        offset_x = self.render_offset_x + camera.scroll.x
+        diagonal_min = math.floor(-offset_x / TILE_SIZE) - 1 - RENDER_MARGIN
+        diagonal_max = math.ceil((screen.get_width() - offset_x) / TILE_SIZE) + 1 + RENDER_MARGIN
+        depth_min = math.floor(-camera.scroll.y * 2 / TILE_SIZE) - 4 - RENDER_MARGIN
+        depth_max = math.ceil((screen.get_height() - camera.scroll.y) * 2 / TILE_SIZE) + RENDER_MARGIN
+
+        x_start = max(0, (diagonal_min + depth_min) // 2)
+        x_end = min(self.grid_length_x, (diagonal_max + depth_max) // 2 + 1)
+        columns = []
+        for x in range(x_start, x_end):
+            # x - y must lie within the diagonals and x + y within the depths
+            y_start = max(0, x - diagonal_max, depth_min - x)
+            y_end = min(self.grid_length_y, x - diagonal_min + 1, depth_max - x + 1)
+            if y_start < y_end:
+                columns.append((x, y_start, y_end))
+        return columns
+
+    def tint_color(self, game_time):
+        """Returns the (red, green, blue, alpha) tint of the day/night cycle at a time, None during the day"""
         # sunrise and sunset times
         sunrise_start = 5   # 5:00 AM
         sunrise_end = 7     # 7:00 AM
         sunset_start = 18   # 6:00 PM
         sunset_end = 21     # 8:00 PM
 
-        # Create a surface for the tint overlay
-        tint_overlay = pg.Surface((screen.get_width(), screen.get_height()), pg.SRCALPHA).convert_alpha()
-
         # Apply blue night tint if time is between sunset_end and sunrise_start
         if game_time >= sunset_end or game_time < sunrise_start:
             # Calculate alpha based on time (darkest at midnight, gradually lightens toward dawn/dusk)
@@ -430,9 +482,9 @@ class World:
                     blue = int(0 * (1 - orange_factor) + 0 * orange_factor)
                     green = int(0 * (1 - orange_factor) + 80 * orange_factor)
                     red = int(80 * (1 - orange_factor) + 150 * orange_factor)
-                    tint_overlay.fill((red, green, blue, alpha))
+                    return (red, green, blue, alpha)
                 else:
-                    tint_overlay.fill((0, 0, 80, alpha))  # Dark blue with alpha transparency
+                    return (0, 0, 80, alpha)  # Dark blue with alpha transparency
             else:
                 # Morning: midnight (alpha=120) to sunrise_start (alpha=50)
                 night_progress = (sunrise_start - game_time) / sunrise_start  # 1 to 0
@@ -445,9 +497,9 @@ class World:
                     blue = int(80 * (1 - orange_factor) + 90 * orange_factor)
                     green = int(0 * (1 - orange_factor) + 80 * orange_factor)
                     red = int(0 * (1 - orange_factor) + 150 * orange_factor)
-                    tint_overlay.fill((red, green, blue, alpha))
+                    return (red, green, blue, alpha)
                 else:
-                    tint_overlay.fill((0, 0, 80, alpha))  # Dark blue with alpha transparency
+                    return (0, 0, 80, alpha)  # Dark blue with alpha transparency
 
         # Apply pinkish/orange hue during sunrise
         elif game_time >= sunrise_start and game_time < sunrise_end:
@@ -455,7 +507,7 @@ class World:
             sunrise_progress = (game_time - sunrise_start) / (sunrise_end - sunrise_start)  # 0 to 1
             alpha = int(80 * (1 - sunrise_progress))
             # Pink/orange sunrise color
-            tint_overlay.fill((150, 80, 90, alpha))
+            return (150, 80, 90, alpha)
 
         # Apply pinkish/orange hue during sunset
         elif game_time >= sunset_start and game_time < sunset_end:
@@ -463,26 +515,95 @@ class World:
             sunset_progress = (game_time - sunset_start) / (sunset_end - sunset_start)  # 0 to 1
             alpha = int(80 * sunset_progress)
             # Pink/orange sunset color
-            tint_overlay.fill((150, 80, 90, alpha))
-
-        # Apply the tint if we have one
-        if game_time >= sunset_start or game_time < sunrise_end:
-            screen.blit(tint_overlay, (0, 0))
+            return (150, 80, 90, alpha)
+
+        # No tint during the day
+        return None
+
+    def create_tint_table(self):
+        """Precomputes the day/night tint for every minute of the day"""
+        # the tint of every hour is blended as a multiply and an add so that
+        # the minutes in between can be interpolated smoothly
+        keyframes = []
+        for hour in range(24):
+            tint = self.tint_color(hour)
+            if tint is None:
+                keyframes.append((1, (0, 0, 0)))
+            else:
+                red, green, blue, alpha = tint
+                opacity = alpha / 255
+                keyframes.append((1 - opacity, (red * opacity, green * opacity, blue * opacity)))
+
+        table = []
+        for minute in range(24 * 60):
+            hour, progress = divmod(minute / 60, 1)
+            start_multiply, start_add = keyframes[int(hour)]
+            end_multiply, end_add = keyframes[(int(hour) + 1) % 24]
+            multiply = round(255 * (start_multiply + (end_multiply - start_multiply) * progress))
+            add = tuple(round(start + (end - start) * progress) for start, end in zip(start_add, end_add))
+            if multiply >= 255 and add == (0, 0, 0):
+                table.append(None)  # daytime, nothing to draw
+            else:
+                table.append(((multiply, multiply, multiply), add))
+        return table
+
+    def changed_rects(self, camera):
+        """Returns the screen areas that changed since the last frame, or None when everything has to be redrawn"""
+        time_of_day = getattr(self.hud, 'time_of_day', 12)
+        tint = self.tint_table[int(time_of_day * 60) % len(self.tint_table)]
+        frame_state = (camera.scroll.x, camera.scroll.y, tint, self.show_agents)
+        moving_sprites = self.moving_sprites | set((rect, None, None) for rect in self.overlay.rects(camera))
+
+        if frame_state != self.last_frame_state or self.world_changed:
+            rects = None
+        else:
+            # sprites that appeared, disappeared, moved or changed depth, at both their old and new position
+            rects = [rect for rect, image, grid_pos in moving_sprites ^ self.last_moving_sprites]
+            if self.animation_frame != self.last_animation_frame:
+                rects += self.water_rects
+
+        self.last_frame_state = frame_state
+        self.last_moving_sprites = moving_sprites
+        self.last_animation_frame = self.animation_frame
+        self.world_changed = False
+        return rects
+
+    def day_night_cycle(self, screen, time_of_day):
+        """Tints the screen according to the time of day"""
+        tint = self.tint_table[int(time_of_day * 60) % len(self.tint_table)]
+        if tint is None:
+            return
+        # same result as blending a tint overlay, the blend surfaces are only refilled when the tint changes
+        if self.tint_surfaces is None or self.tint_surfaces[0].get_size() != screen.get_size():
+            self.tint_surfaces = (pg.Surface(screen.get_size()).convert(), pg.Surface(screen.get_size()).convert())
+            self.tint = None
+        multiply_surface, add_surface = self.tint_surfaces
+        if tint != self.tint:
+            multiply_surface.fill(tint[0])
+            add_surface.fill(tint[1])
+            self.tint = tint
+        # blended blits are much faster than blended fills
+        screen.blit(multiply_surface, (0, 0), special_flags=pg.BLEND_RGB_MULT)
+        screen.blit(add_surface, (0, 0), special_flags=pg.BLEND_RGB_ADD)
 
     def create_world(self):
         """Initializes the world and its coordinates"""
+        # generate the terrain of the whole map in one batch
+        terrain = TerrainGenerator(self.seed, self.grid_length_x, self.grid_length_y).generate()
+        elevation = terrain["elevation"].tolist()
+        moisture = terrain["moisture"].tolist()
+        tiles = terrain["tile"].tolist()
+
         world = []
         for grid_x in range(self.grid_length_x):
             world.append([])
             for grid_y in range(self.grid_length_y):
-                world_tile = self.grid_to_world(grid_x, grid_y)
+                world_tile = self.grid_to_world(grid_x, grid_y, elevation[grid_x][grid_y], moisture[grid_x][grid_y], tiles[grid_x][grid_y])
                 world[grid_x].append(world_tile)
-                render_pos = world_tile["render_pos"]
-                self.grass_tiles.blit(self.tiles["block"], (render_pos[0] + self.grass_tiles.get_width()/2, render_pos[1]))
         return world
 
-    def grid_to_world(self, grid_x, grid_y):
-        """converts the empty world grid to one with a procedurally generated world"""
+    def grid_to_world(self, grid_x, grid_y, elevation, moisture, tile):
+        """converts a grid position and its generated terrain to a world tile"""
         rect = [
             (grid_x * TILE_SIZE, grid_y * TILE_SIZE),
             (grid_x * TILE_SIZE + TILE_SIZE, grid_y * TILE_SIZE),
@@ -494,57 +615,6 @@ class World:
         minx = min([x for x, y in iso_poly])
         miny = min([y for x, y in iso_poly])
 
-        # Add seed to coordinates for unique but consistent generation
-        base_x = grid_x + self.seed * 0.1
-        base_y = grid_y + self.seed * 0.1
-
-        # Perlin noise generators
-        elevation_noise = noise.PerlinNoise(octaves=1, seed=int(self.seed))
-        moisture_noise = noise.PerlinNoise(octaves=2, seed=int(self.seed + 1))
-
-        # Calculate elevation using multiple octaves (2D noise)
-        elevation = 0
-        amplitude = 1.1
-        frequency = 1.0
-        persistence = 0.5
-        octaves = 2
-
-        for i in range(octaves):
-            elevation += amplitude * elevation_noise([base_x / self.perlin_scale * frequency, base_y / self.perlin_scale * frequency])
-            amplitude *= persistence
-            frequency *= 2
-
-        # Calculate moisture (2D noise)
-        moisture = moisture_noise([base_x / self.perlin_scale * 2, base_y / self.perlin_scale * 2])
-
-        # Normalize values
-        elevation = (elevation + 1) / 2
-        moisture = (moisture + 1) / 2
-
-        # Use seeded random for consistent variation
-        random_variation = random.random()
-
-        # Biome determination
-        if elevation <= 0.35:
-            tile = "water"
-        elif elevation <= 0.41:  # Mud around water
-            tile = "mud"
-        else:
-            if elevation > 0.8:
-                tile = "rock"
-            elif moisture > 0.6 and elevation < 0.7:
-                tile = "trees"
-            else:
-                if random_variation < 0.04:
-                    if moisture > 0.4:
-                        tile = "trees"
-                    elif elevation > 0.58: # interpret higher elevation as rocks
-                        tile = "rock"
-                    else:
-                        tile = ""
-                else:
-                    tile = ""
-
         out = {
             "grid": [grid_x, grid_y],
             "cart_rect": rect,
@@ -556,14 +626,17 @@ class World:
             "buildable": True if tile in ["", "trees"] else False,
             "empty": True if tile in ["", "mud", "water"] else False,
             "walkable": True if tile in ["", "mud"] else False,
-            "user_built": False
+            "user_built": False,
+            "sprites": [],  # (image, world x, world y) of the trees or rock, road and building on the tile
+            "warning_pos": None  # world position the warning icon is centered on
         }
+        out["sprites"] = self.terrain_sprites(out)
 
         return out
 
-    def check_adjacent_roads(self, grid_pos):
+    def check_adjacent_roads(self, grid_pos, name):
         """Check if the tile has a road adjacent to it"""
-        if self.hud.selected_tile["name"] == "road":
+        if name == "road":
             return True
         else:
         # Check if the tile has a road adjacent to it
@@ -593,7 +666,7 @@ class World:
     def mouse_to_grid(self, x, y, scroll):
         """convert mouse position to grid coordinates"""
         # transform to world position (remove camera scroll and offset)
-        world_x = x - scroll.x - self.grass_tiles.get_width()/2
+        world_x = x - scroll.x - self.render_offset_x
         world_y = y - scroll.y
         # transform to cart (inverse of cart_to_iso)
         cart_y = (2*world_y - world_x)/2
@@ -628,21 +701,21 @@ class World:
         """Load water animation frames"""
         frames = []
         for i in range(4):  # Adjust range based on number of frames you have
-            frame = pg.image.load(f"assets/graphics/water_animation/water_{i}.png").convert_alpha()
+            frame = assets.image(f"assets/graphics/water_animation/water_{i}.png")
             frames.append(frame)
         return frames
 
     def load_images(self):
         """Loads all textures used in the game."""
-        block = pg.image.load("assets/graphics/block.png").convert_alpha()
-        rock = pg.image.load("assets/graphics/rock.png").convert_alpha()
-        trees = pg.image.load("assets/graphics/trees.png").convert_alpha()
-        water = pg.image.load("assets/graphics/water.png").convert_alpha()
-        mud = pg.image.load("assets/graphics/mud.png").convert_alpha()
-        residential_building = pg.image.load("assets/graphics/residential_building.png").convert_alpha()
-        factory = pg.image.load("assets/graphics/factory.png").convert_alpha()
-        solar_panels = pg.image.load("assets/graphics/solar_panels.png").convert_alpha()
-        water_treatment_plant = pg.image.load("assets/graphics/water_treatment_plant.png").convert_alpha()
+        block = assets.image("assets/graphics/block.png")
+        rock = assets.image("assets/graphics/rock.png")
+        trees = assets.image("assets/graphics/trees.png")
+        water = assets.image("assets/graphics/water.png")
+        mud = assets.image("assets/graphics/mud.png")
+        residential_building = assets.image("assets/graphics/residential_building.png")
+        factory = assets.image("assets/graphics/factory.png")
+        solar_panels = assets.image("assets/graphics/solar_panels.png")
+        water_treatment_plant = assets.image("assets/graphics/water_treatment_plant.png")
 
         return {
             "block": block,
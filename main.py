@@ -1,8 +1,21 @@
+import argparse
+import os
 import pygame as pg
 from game.game import Game
+from game.headless import Headless
 from game.menu import Menu
 from game.settings import HORIZONTAL_RESOLUTION, VERTICAL_RESOLUTION, FULLSCREEN
 
+def headless(ticks, seed):
+    # no window, no sound, no frame cap
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pg.init()
+    pg.mixer.init()
+    screen = pg.display.set_mode((HORIZONTAL_RESOLUTION, VERTICAL_RESOLUTION))
+    Headless(screen, pg.time.Clock(), seed, ticks).run()
+    pg.quit()
+
 def main():
     running = True
     playing = False
@@ -39,4 +52,12 @@ def main():
     pg.quit()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Young Thug City")
+    parser.add_argument("--headless", action="store_true", help="simulate a generated city without a window, as fast as possible")
+    parser.add_argument("--ticks", type=int, default=10000, help="number of simulation steps to run headless")
+    parser.add_argument("--seed", type=int, default=None, help="world seed")
+    args = parser.parse_args()
+    if args.headless:
+        headless(args.ticks, args.seed)
+    else:
+        main()